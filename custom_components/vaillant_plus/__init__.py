@@ -12,8 +12,9 @@ from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.typing import ConfigType
 from vaillant_plus_cn_api import Token
 
-from .client import VaillantClient
+from .client import VaillantClient, snapshot_store
 from .const import (
+    ACCOUNTS,
     API_CLIENT,
     CONF_DID,
     CONF_TOKEN,
@@ -47,7 +48,7 @@ _LOGGER = logging.getLogger(__name__)
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     hass.data.setdefault(
         DOMAIN,
-        {API_CLIENT: {}, DISPATCHERS: {}},
+        {API_CLIENT: {}, DISPATCHERS: {}, ACCOUNTS: {}},
     )
     return True
 
@@ -82,6 +83,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unsub_stop = hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, close_client)
     hass.data[DOMAIN][DISPATCHERS][device_id].append(unsub_stop)
 
+    await client.async_restore()
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     task = hass.loop.create_task(client.start())
@@ -112,3 +114,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             unsub_or_task()
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the saved device snapshot of a deleted config entry."""
+    await snapshot_store(hass, entry.data.get(CONF_DID)).async_remove()
@@ -0,0 +1,230 @@
+"""Vaillant Plus cloud account shared by all devices of one user."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+import logging
+import random
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later
+from vaillant_plus_cn_api import Device, Token, VaillantApiClient
+
+from .const import (
+    ACCOUNTS,
+    DEFAULT_TOKEN_LIFETIME,
+    DEVICE_LIST_TTL,
+    DOMAIN,
+    EVT_TOKEN_UPDATED,
+    MIN_TOKEN_LIFETIME,
+    TOKEN_RENEW_AT,
+    TOKEN_RENEW_JITTER,
+    TOKEN_RENEW_RETRY,
+)
+from .utils import get_aiohttp_session
+
+if TYPE_CHECKING:
+    from .client import VaillantClient
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_get_account(hass: HomeAssistant, token: Token) -> VaillantAccount:
+    """Return the account of the token's user, creating it on first use."""
+    accounts: dict[str, VaillantAccount] = hass.data.setdefault(
+        DOMAIN, {}
+    ).setdefault(ACCOUNTS, {})
+    if (account := accounts.get(token.username)) is None:
+        account = VaillantAccount(hass, token)
+        accounts[token.username] = account
+    return account
+
+
+class VaillantAccount:
+    """Owns the API client, token and device list of one cloud account.
+
+    Every device client of the same username shares one account, so entries
+    on one account log in and fetch the device list once.
+    """
+
+    def __init__(self, hass: HomeAssistant, token: Token) -> None:
+        self._hass = hass
+        self._clients: set[VaillantClient] = set()
+        self._running_clients = 0
+
+        self._api_client = VaillantApiClient(session=get_aiohttp_session(hass))
+        self._api_client.update_token(token)
+
+        # Renewed ahead of expiry; the lifetime is lowered when a token expires early.
+        self._token = token
+        self._token_issued_at: float | None = None
+        self._token_lifetime: float = DEFAULT_TOKEN_LIFETIME
+        self._refresh_task: asyncio.Task[Token] | None = None
+        self._cancel_token_renewal: CALLBACK_TYPE | None = None
+
+        self._device_list: list[Device] | None = None
+        self._device_list_fetched_at = 0.0
+        self._device_list_request: asyncio.Future[list[Device]] | None = None
+
+    @property
+    def api_client(self) -> VaillantApiClient:
+        return self._api_client
+
+    @property
+    def token(self) -> Token:
+        return self._token
+
+    @property
+    def username(self) -> str:
+        return self._token.username
+
+    @callback
+    def async_add_client(self, client: VaillantClient) -> None:
+        """Register a device client using this account."""
+        self._clients.add(client)
+
+    @callback
+    def async_remove_client(self, client: VaillantClient) -> None:
+        """Unregister a device client, dropping the account after the last one."""
+        self._clients.discard(client)
+        if len(self._clients) > 0:
+            return
+
+        self._async_cancel_token_renewal()
+        accounts = self._hass.data.get(DOMAIN, {}).get(ACCOUNTS, {})
+        if accounts.get(self.username) is self:
+            del accounts[self.username]
+
+    @callback
+    def async_client_started(self) -> None:
+        """Keep the token renewed while at least one client is connecting."""
+        self._running_clients += 1
+        if self._running_clients == 1:
+            self._async_schedule_token_renewal()
+
+    @callback
+    def async_client_stopped(self) -> None:
+        """Stop renewing the token once no client is connecting anymore."""
+        self._running_clients = max(0, self._running_clients - 1)
+        if self._running_clients == 0:
+            self._async_cancel_token_renewal()
+
+    async def async_get_device_list(self) -> list[Device]:
+        """Return the device list, fetched once per DEVICE_LIST_TTL for all clients."""
+        if (
+            self._device_list is not None
+            and monotonic() - self._device_list_fetched_at < DEVICE_LIST_TTL
+        ):
+            return self._device_list
+
+        if self._device_list_request is not None:
+            return await asyncio.shield(self._device_list_request)
+
+        request: asyncio.Future[list[Device]] = self._hass.loop.create_future()
+        self._device_list_request = request
+        try:
+            device_list = await self._api_client.get_device_list()
+        except asyncio.CancelledError:
+            request.cancel()
+            raise
+        except Exception as error:
+            request.set_exception(error)
+            # Only concurrent callers need to see the error.
+            request.exception()
+            raise
+        finally:
+            self._device_list_request = None
+
+        request.set_result(device_list)
+        self._device_list = device_list
+        self._device_list_fetched_at = monotonic()
+        return device_list
+
+    @callback
+    def async_invalidate_device_list(self) -> None:
+        """Fetch the device list again on next use."""
+        self._device_list = None
+
+    @callback
+    def update_token(self, token: Token) -> None:
+        """Use a newly issued token."""
+        self._token = token
+        self._token_issued_at = monotonic()
+        self._api_client.update_token(token)
+        if self._cancel_token_renewal is not None:
+            self._async_schedule_token_renewal()
+
+    async def async_refresh_token(self, expired: bool = True) -> Token:
+        """Log in again, sharing one login between all concurrent callers."""
+        if expired and self._token_issued_at is not None:
+            lifetime = monotonic() - self._token_issued_at
+            if MIN_TOKEN_LIFETIME <= lifetime < self._token_lifetime:
+                _LOGGER.info("Token expired after %ds, renewing earlier from now on", lifetime)
+                self._token_lifetime = lifetime
+
+        if self._refresh_task is None:
+            if expired:
+                _LOGGER.info("Token expired, retrieve new token...")
+            else:
+                _LOGGER.debug("Token about to expire, retrieve new token...")
+            self._refresh_task = self._hass.async_create_task(self._async_login())
+
+            @callback
+            def refresh_done(task: asyncio.Task[Token]) -> None:
+                if self._refresh_task is task:
+                    self._refresh_task = None
+
+            self._refresh_task.add_done_callback(refresh_done)
+
+        return await asyncio.shield(self._refresh_task)
+
+    async def _async_login(self) -> Token:
+        """Log in again and announce the new token once."""
+        token_new = await self._api_client.login(self._token.username, self._token.password)
+        self.update_token(token_new)
+        async_dispatcher_send(
+            self._hass, EVT_TOKEN_UPDATED.format(token_new.username), token_new
+        )
+        return token_new
+
+    @callback
+    def _async_schedule_token_renewal(self, delay: float | None = None) -> None:
+        """Renew the token ahead of its expected expiry, with jitter."""
+        self._async_cancel_token_renewal()
+
+        if delay is None:
+            age = 0.0
+            if self._token_issued_at is not None:
+                age = monotonic() - self._token_issued_at
+            jitter = random.uniform(0, self._token_lifetime * TOKEN_RENEW_JITTER)
+            delay = max(0.0, self._token_lifetime * TOKEN_RENEW_AT - age - jitter)
+
+        self._cancel_token_renewal = async_call_later(
+            self._hass, delay, self._async_renew_token
+        )
+
+    @callback
+    def _async_cancel_token_renewal(self) -> None:
+        if self._cancel_token_renewal is not None:
+            self._cancel_token_renewal()
+            self._cancel_token_renewal = None
+
+    async def _async_renew_token(self, _now: datetime) -> None:
+        """Renew the token in the background."""
+        self._cancel_token_renewal = None
+        try:
+            await self.async_refresh_token(expired=False)
+        except Exception as error:  # pylint: disable=broad-except
+            _LOGGER.warning(
+                "Renewing token failed: %s, retrying in %ds", error, TOKEN_RENEW_RETRY
+            )
+            if self._running_clients > 0:
+                self._async_schedule_token_renewal(TOKEN_RENEW_RETRY)
+            return
+
+        if self._running_clients > 0:
+            self._async_schedule_token_renewal()
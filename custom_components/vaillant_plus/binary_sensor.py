@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass
 import logging
 from typing import Any, Literal
@@ -10,17 +11,80 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .client import VaillantClient
-from .const import CONF_DID, DISPATCHERS, DOMAIN, EVT_DEVICE_CONNECTED, API_CLIENT
-from .entity import VaillantEntity
+from .const import CONF_DID, DISPATCHERS, DOMAIN, API_CLIENT
+from .entity import VaillantEntity, async_discover_descriptions
+from .state import ATTRIBUTE_KEYS, BIT_FIELD_KEYS
 
 _LOGGER = logging.getLogger(__name__)
 
+BinarySensorDecoder = Callable[[Any], bool]
+
+
+def bit_field_decoder(bit: int) -> BinarySensorDecoder:
+    """Return a decoder reading bit of a status word parsed by the client."""
+    mask = 1 << bit
+
+    def decode(word: int) -> bool:
+        return word & mask != 0
+
+    return decode
+
+
+def enum_decoder(*on_values: Any) -> BinarySensorDecoder:
+    """Return a decoder that is on for any of on_values."""
+    on = frozenset(on_values)
+
+    def decode(value: Any) -> bool:
+        return value in on
+
+    return decode
+
+
+def equality_decoder(on_state: Any) -> BinarySensorDecoder:
+    """Return a decoder that is on for on_state only."""
+
+    def decode(value: Any) -> bool:
+        return value == on_state
+
+    return decode
+
+
+def truthy_decoder(value: Any) -> bool:
+    """Decode any truthy value as on."""
+    return bool(value)
+
+
+# Decoders of attributes that are not a plain comparison with on_state.
+KEY_DECODERS: dict[str, BinarySensorDecoder] = {
+    "RF_Status": enum_decoder(3),
+}
+
+# Status words of BIT_FIELD_KEYS only have their first bit documented. The other
+# bits get disabled diagnostic entities, keyed and named after their word here.
+STATUS_WORDS: dict[str, tuple[str, str]] = {
+    "Boiler_info3_bit0": ("Boiler_info3_word", "Boiler heating demand word"),
+    "Boiler_info5_bit4": ("Boiler_info5_word", "Boiler refill water word"),
+}
+# Entities are offered for the bits of the word the device actually sends, up to
+# this many bits.
+STATUS_WORD_MAX_BITS = 8
+
+
+def has_status_word_bit(
+    description: VaillantBinarySensorDescription, device_attrs: Mapping[str, Any]
+) -> bool:
+    """Return whether the status word the device sent is long enough for the bit."""
+    if not description.bit:
+        # Not a status word bit, or the documented first one.
+        return True
+    return len(str(device_attrs[description.attr])) > description.bit
+
 
 @dataclass
 class VaillantBinarySensorDescriptionMixin:
@@ -35,6 +99,30 @@ class VaillantBinarySensorDescription(
 ):
     """Describe a Vaillant binary sensor."""
 
+    # The attribute holding the value, the key unless entities share the attribute.
+    attr: str = ""
+    # Bit of a status word, read from the word the client parsed.
+    bit: int | None = None
+    # Turns a raw attribute value into the on state, resolved once on creation.
+    decoder: BinarySensorDecoder | None = None
+
+    def __post_init__(self) -> None:
+        """Pick the attribute and decoder of descriptions not setting them."""
+        if not self.attr:
+            self.attr = self.key
+        if self.bit is None and self.attr in BIT_FIELD_KEYS:
+            self.bit = 0
+        if self.decoder is not None:
+            return
+        if self.bit is not None:
+            decoder = bit_field_decoder(self.bit)
+        elif (decoder := KEY_DECODERS.get(self.key)) is None:
+            if self.on_state is None:
+                decoder = truthy_decoder
+            else:
+                decoder = equality_decoder(self.on_state)
+        self.decoder = decoder
+
 
 BINARY_SENSOR_DESCRIPTIONS = (
     VaillantBinarySensorDescription(
@@ -107,6 +195,22 @@ BINARY_SENSOR_DESCRIPTIONS = (
         entity_category=EntityCategory.DIAGNOSTIC,
         on_state=True,
     ),
+    *(
+        VaillantBinarySensorDescription(
+            key=f"{key}_bit{bit}",
+            name=f"{name} bit {bit}",
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+            on_state=True,
+            attr=attr,
+            bit=bit,
+        )
+        for attr, (key, name) in STATUS_WORDS.items()
+        for bit in range(1, STATUS_WORD_MAX_BITS)
+    ),
+)
+ATTRIBUTE_KEYS.register(
+    description.attr for description in BINARY_SENSOR_DESCRIPTIONS
 )
 
 
@@ -119,29 +223,26 @@ async def async_setup_entry(
         entry.entry_id
     ]
 
-    added_entities = []
-
     @callback
-    def async_new_entities(device_attrs: dict[str, Any]):
-        _LOGGER.debug(
-            "add vaillant binary sensor entities. device attrs: %s", device_attrs
+    def async_new_binary_sensors(
+        descriptions: list[VaillantBinarySensorDescription],
+    ) -> None:
+        for description in descriptions:
+            client.async_entity_added(Platform.BINARY_SENSOR, description.key)
+        async_add_entities(
+            VaillantBinarySensorEntity(client, description)
+            for description in descriptions
         )
-        new_entities = []
-        for description in BINARY_SENSOR_DESCRIPTIONS:
-            if (
-                description.key in device_attrs
-                and description.key not in added_entities
-            ):
-                new_entities.append(VaillantBinarySensorEntity(client, description))
-                added_entities.append(description.key)
-
-        if len(new_entities) > 0:
-            async_add_entities(new_entities)
-
-    unsub = async_dispatcher_connect(
-        hass, EVT_DEVICE_CONNECTED.format(device_id), async_new_entities
-    )
 
+    unsub = async_discover_descriptions(
+        client,
+        Platform.BINARY_SENSOR,
+        BINARY_SENSOR_DESCRIPTIONS,
+        async_new_binary_sensors,
+        # The bits of a status word share their attribute.
+        attr_of=lambda description: description.attr,
+        applies=has_status_word_bit,
+    )
     hass.data[DOMAIN][DISPATCHERS][device_id].append(unsub)
 
     return True
@@ -159,29 +260,26 @@ class VaillantBinarySensorEntity(VaillantEntity, BinarySensorEntity):
     ):
         super().__init__(client)
         self.entity_description = description
+        self._decode = description.decoder
 
     @property
-    def unique_id(self) -> str | None:
-        """Return a unique ID."""
-        return f"{self.device.id}_{self.entity_description.key}"
+    def device_attr_keys(self) -> tuple[str, ...]:
+        """Return the device attributes this entity consumes."""
+        return (self.entity_description.attr,)
 
     @callback
     def update_from_latest_data(self, data: dict[str, Any]) -> None:
         """Update the entity from the latest data."""
-        if self.entity_description.key not in data:
+        if self.entity_description.attr not in data:
             return
-        value: Any = data.get(self.entity_description.key)
+        value: Any = data.get(self.entity_description.attr)
         self._attr_available = value is not None
         if value is None:
             return
-
-        if self.entity_description.key == "RF_Status":
-            self._attr_is_on = value == 3
-        elif self.entity_description.key == "Boiler_info3_bit0":
-            self._attr_is_on = str(value).startswith("1")
-        elif self.entity_description.key == "Boiler_info5_bit4":
-            self._attr_is_on = str(value).startswith("1")
-        elif self.entity_description.on_state is not None:
-            self._attr_is_on = value == self.entity_description.on_state
-        else:
-            self._attr_is_on = value is True
+        if self.entity_description.bit is not None:
+            value = self._client.bit_field(self.entity_description.attr)
+            if value is None:
+                # The word was not parsed, the bit is unknown.
+                self._attr_is_on = None
+                return
+        self._attr_is_on = self._decode(value)
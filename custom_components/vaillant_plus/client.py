@@ -2,25 +2,123 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import asdict
+from datetime import datetime
 import logging
+import random
+from time import monotonic
 from typing import Any
 
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
 from vaillant_plus_cn_api import (
     EVT_DEVICE_ATTR_UPDATE,
     Device,
+    STATE_CONNECTED,
     InvalidAuthError,
     Token,
-    VaillantApiClient,
     VaillantWebsocketClient,
 )
 
+from .account import async_get_account
+from .state import ATTRIBUTE_KEYS, BIT_FIELD_KEYS, DeviceSnapshot, parse_bit_field
 from .utils import get_aiohttp_session
-from .const import EVT_DEVICE_CONNECTED, EVT_DEVICE_UPDATED, EVT_TOKEN_UPDATED
+from .const import (
+    CONNECTION_BACKOFF,
+    CONNECTION_CLOSED,
+    CONNECTION_CONNECTING,
+    CONNECTION_DEGRADED,
+    CONNECTION_SUBSCRIBED,
+    DEFAULT_COMMAND_WINDOW,
+    DEFAULT_UPDATE_WINDOW,
+    DEVICE_LIST_TTL,
+    DOMAIN,
+    EVT_CONNECTION_STATE,
+    EVT_LIVENESS_CHECKED,
+    EVT_UNKNOWN_ATTRS,
+    HEALTHY_SESSION_DURATION,
+    LIVENESS_CHECK_INTERVAL,
+    LIVENESS_DEFAULT_TIMEOUT,
+    LIVENESS_GAP_FACTOR,
+    LIVENESS_GAP_HALF_LIFE,
+    LIVENESS_HEARTBEAT_INTERVAL,
+    LIVENESS_MAX_TIMEOUT,
+    LIVENESS_MIN_TIMEOUT,
+    POLL_JITTER,
+    POLL_MAX_INTERVAL,
+    POLL_MIN_INTERVAL,
+    RECONCILE_INTERVAL,
+    RECONNECT_BASE_DELAY,
+    RECONNECT_MAX_DELAY,
+    RECONNECT_SPREAD,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_TIMEOUT,
+    STORAGE_VERSION,
+    TRACE_SAMPLE_INTERVAL,
+    UNKNOWN_ATTRS_LIMIT,
+)
 
 _LOGGER = logging.getLogger(__name__)
+# Samples of the device payloads, only written if this logger is set to debug itself.
+_TRACE_LOGGER = logging.getLogger(f"{__name__}.trace")
+
+
+def _trace_enabled() -> bool:
+    """Return True if payload tracing was opted into explicitly."""
+    return _TRACE_LOGGER.level != logging.NOTSET and _TRACE_LOGGER.isEnabledFor(
+        logging.DEBUG
+    )
+
+
+def snapshot_store(hass: HomeAssistant, device_id: str) -> Store[dict[str, Any]]:
+    """Return the store holding the last known snapshot of a device."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{device_id}")
+
+
+class _Discovery:
+    """A platform waiting for the attributes its entity requires."""
+
+    __slots__ = ("keys", "predicate", "on_discovered")
+
+    def __init__(
+        self,
+        keys: tuple[str, ...],
+        predicate: Callable[[Mapping[str, Any]], bool] | None,
+        on_discovered: Callable[[], None],
+    ) -> None:
+        self.keys = keys
+        self.predicate = predicate
+        self.on_discovered = on_discovered
+
+
+class _HeartbeatWebsocketClient(VaillantWebsocketClient):
+    """Websocket client reporting the keepalive pings of the library.
+
+    The library consumes pongs itself and only pings again heartbeat_interval
+    after the last pong, so each of its pings shows the previous one was
+    answered.
+    """
+
+    def __init__(
+        self, *args: Any, on_heartbeat: Callable[[], None], **kwargs: Any
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self._on_heartbeat = on_heartbeat
+
+    async def ping(self) -> None:
+        """Send a keepalive ping of the library."""
+        self._on_heartbeat()
+        await super().ping()
+
+    async def probe(self) -> None:
+        """Send a ping that is not counted as a heartbeat."""
+        await super().ping()
+
 
 class VaillantClient:
     """API client for communicating with the cloud."""
@@ -30,41 +128,799 @@ class VaillantClient:
         hass: HomeAssistant,
         token: Token,
         device_id: str,
+        update_window: float = DEFAULT_UPDATE_WINDOW,
+        command_window: float = DEFAULT_COMMAND_WINDOW,
     ) -> None:
         self._hass = hass
         self._device_id = device_id
-        self._device_attrs: dict[str, Any] = {}
+        # Dispatcher signals of this device, formatted once.
+        self._signals = {
+            event: event.format(device_id)
+            for event in (
+                EVT_CONNECTION_STATE,
+                EVT_LIVENESS_CHECKED,
+                EVT_UNKNOWN_ATTRS,
+            )
+        }
+        self._flush_count = 0
+        self._device_attrs = DeviceSnapshot()
+        # Status words of BIT_FIELD_KEYS, parsed once when they arrive.
+        self._bit_fields: dict[str, int] = {}
         self._device: Device | None = None
-        self._token = token
+        self._device_resolved_at: float | None = None
+        self._attr_listeners: dict[str, list[Callable[[dict[str, Any]], None]]] = {}
+        self._suppressed_writes = 0
+        # Pending platform discoveries, indexed by the keys that trigger them.
+        self._discoveries: dict[str, list[_Discovery]] = {}
+
+        # Frames are merged here and flushed once per loop tick or update window.
+        self._update_window = update_window
+        self._pending_attrs: dict[str, Any] = {}
+        self._flush_handle: asyncio.Handle | None = None
+        self._dropped_values = 0
+
+        # How often each attribute unknown to all descriptions arrived, bounded.
+        self._unknown_attrs: dict[str, int] = {}
+        self._dropped_unknown_attrs = 0
+
+        # Commands are merged here and sent once the command window passes quietly.
+        self._command_window = command_window
+        self._pending_commands: dict[str, Any] = {}
+        self._command_waiters: list[asyncio.Future[bool]] = []
+        self._command_handle: asyncio.TimerHandle | None = None
+        self._command_lock = asyncio.Lock()
+
+        # Last known device snapshot, restored after a restart until live data arrives.
+        self._store = snapshot_store(hass, device_id)
+        self._snapshot_save_pending = False
+        self._entity_keys: dict[str, set[str]] = {}
+        self._restored_entity_keys: dict[str, set[str]] = {}
+        self._stale = False
 
-        self._api_client = VaillantApiClient(session=get_aiohttp_session(self._hass))
+        self._account = async_get_account(hass, token)
+        self._account.async_add_client(self)
+        self._api_client = self._account.api_client
 
         self._websocket_client: VaillantWebsocketClient | None = None
 
         self._sleep_task: asyncio.Task | None = None
+        self._wake_requested = False
+        self._reconnect_delay = 0.0
+        self._subscribed_at: float | None = None
 
-        self._state = "INITED"
+        # Liveness of the subscribed session, judged by the largest frame gaps seen.
+        self._last_frame_at: float | None = None
+        self._last_heartbeat_at: float | None = None
+        self._probe_sent_at: float | None = None
+        self._frame_gap: float | None = None
+        self._sample_next_frame = False
+        self._cancel_watchdog: CALLBACK_TYPE | None = None
+
+        # Snapshot polling while push is down.
+        self._poll_interval = POLL_MIN_INTERVAL
+        self._cancel_poll: CALLBACK_TYPE | None = None
+        self._poll_task: asyncio.Task | None = None
+        self._polled = False
+
+        # Reconciliation of the merged attributes against full snapshots.
+        self._cancel_reconcile: CALLBACK_TYPE | None = None
+        self._reconcile_task: asyncio.Task | None = None
+        self._drift_count = 0
+        self._drifted_keys = 0
+
+        # Every session gets a new generation, frames of older ones are dropped.
+        self._generation = 0
+        self._rejected_frames = 0
+        self._sequence = 0
+        self._attr_sequence: dict[str, int] = {}
+        self._attr_updated_at: dict[str, datetime] = {}
+
+        self._state: str | None = None
 
     @property
     def device(self) -> Device:
         return self._device
 
     @property
-    def device_attrs(self) -> dict[str, Any]:
+    def device_attrs(self) -> DeviceSnapshot:
+        """Return the current attributes, an immutable snapshot safe to keep."""
         return self._device_attrs
 
+    def signal(self, event: str) -> str:
+        """Return the dispatcher signal of event for this device."""
+        return self._signals[event]
+
+    @property
+    def device_id(self) -> str:
+        return self._device_id
+
     @property
     def is_connected(self) -> bool:
-        """Return True if the client is connected to the cloud."""
-        return self._state != "CLOSED" and self._device is not None
+        """Return True while push or polling delivers data of the device.
+
+        A session that just ended keeps counting as connected while the
+        client reconnects right away with the last known values.
+        """
+        return (
+            self._state in (CONNECTION_SUBSCRIBED, CONNECTION_DEGRADED) or self._polled
+        ) and self._device is not None
+
+    @property
+    def is_polling(self) -> bool:
+        """Return True while snapshots are polled because push is down."""
+        return self._cancel_poll is not None or self._poll_task is not None
+
+    @property
+    def connection_state(self) -> str | None:
+        """Return the connection state, None until started."""
+        return self._state
+
+    @callback
+    def _async_set_connection_state(self, state: str) -> None:
+        """Move to a new connection state and announce it."""
+        if state == self._state:
+            return
+        _LOGGER.debug("Connection state of %s: %s -> %s", self._device_id, self._state, state)
+        self._state = state
+        if state in (CONNECTION_BACKOFF, CONNECTION_CLOSED):
+            # Restored values are no longer shown once connecting has failed.
+            self._stale = False
+        if state == CONNECTION_SUBSCRIBED:
+            self._subscribed_at = monotonic()
+            self._probe_sent_at = None
+            self._async_schedule_watchdog()
+            self._async_schedule_reconcile()
+        else:
+            self._async_cancel_reconcile()
+        if state == CONNECTION_CLOSED:
+            self._async_cancel_watchdog()
+        if state == CONNECTION_BACKOFF:
+            self._async_start_polling()
+        elif state in (CONNECTION_SUBSCRIBED, CONNECTION_CLOSED):
+            self._async_stop_polling()
+        async_dispatcher_send(
+            self._hass, self._signals[EVT_CONNECTION_STATE], state
+        )
+
+    @property
+    def last_frame_age(self) -> float | None:
+        """Return the seconds since the last frame, None before the first one."""
+        if self._last_frame_at is None:
+            return None
+        return monotonic() - self._last_frame_at
+
+    @property
+    def liveness_timeout(self) -> float:
+        """Return the silence after which the session is probed with a ping."""
+        if self._frame_gap is None:
+            return LIVENESS_DEFAULT_TIMEOUT
+        return min(
+            LIVENESS_MAX_TIMEOUT,
+            max(LIVENESS_MIN_TIMEOUT, self._frame_gap * LIVENESS_GAP_FACTOR),
+        )
+
+    @callback
+    def _async_record_frame(self, first: bool = False) -> None:
+        """Track the frame age and learn the largest gap between frames."""
+        now = monotonic()
+        # The first frame of a session is delivered twice, and the gap to the
+        # previous session says nothing about the device cadence.
+        if not first and self._sample_next_frame and self._last_frame_at is not None:
+            gap = now - self._last_frame_at
+            if self._frame_gap is None:
+                self._frame_gap = gap
+            else:
+                # Decay by elapsed time, so a burst of frames cannot shrink it.
+                self._frame_gap = max(
+                    gap, self._frame_gap * 0.5 ** (gap / LIVENESS_GAP_HALF_LIFE)
+                )
+        self._sample_next_frame = not first
+        self._last_frame_at = now
+
+    @callback
+    def _async_record_heartbeat(self) -> None:
+        """Note that the server answered the previous keepalive ping."""
+        self._last_heartbeat_at = monotonic()
+
+    @callback
+    def _async_schedule_watchdog(self) -> None:
+        self._async_cancel_watchdog()
+        self._cancel_watchdog = async_call_later(
+            self._hass, LIVENESS_CHECK_INTERVAL, self._async_check_liveness
+        )
+
+    @callback
+    def _async_cancel_watchdog(self) -> None:
+        if self._cancel_watchdog is not None:
+            self._cancel_watchdog()
+            self._cancel_watchdog = None
+
+    async def _async_check_liveness(self, _now: datetime) -> None:
+        """Check the subscribed session and announce the new frame age.
+
+        The check keeps running while the connection is down, so the frame
+        age stays current exactly when it matters.
+        """
+        self._async_cancel_watchdog()
+        if self._state == CONNECTION_SUBSCRIBED:
+            await self._async_check_session()
+        if self._state == CONNECTION_CLOSED:
+            return
+        async_dispatcher_send(self._hass, self._signals[EVT_LIVENESS_CHECKED])
+        self._async_schedule_watchdog()
+
+    async def _async_check_session(self) -> None:
+        """Probe a quiet session with a ping and drop it if nothing answers.
+
+        Any frame or keepalive heartbeat after the probe counts as an answer.
+        Writes on a half-open connection are buffered and do not fail, so only
+        a probe still unanswered at the next check ends the session, after
+        which start() reconnects right away.
+        """
+        websocket_client = self._websocket_client
+        if websocket_client is None or self._last_frame_at is None:
+            return
+
+        last_heard_at = max(self._last_frame_at, self._last_heartbeat_at or 0.0)
+        now = monotonic()
+        try:
+            if self._probe_sent_at is not None:
+                if last_heard_at > self._probe_sent_at:
+                    self._probe_sent_at = None
+                else:
+                    _LOGGER.warning(
+                        "Device %s did not answer a ping after %ds without data,"
+                        " reconnecting",
+                        self._device_id,
+                        now - last_heard_at,
+                    )
+                    await websocket_client.close()
+                    return
+            if now - last_heard_at >= self.liveness_timeout:
+                self._probe_sent_at = now
+                await websocket_client.probe()
+        except Exception as error:  # pylint: disable=broad-except
+            _LOGGER.debug("Liveness check failed: %s, reconnecting", error)
+            await websocket_client.close()
+
+    @property
+    def is_stale(self) -> bool:
+        """Return True while the device data is restored and not confirmed live yet."""
+        return self._stale
+
+    async def async_restore(self) -> None:
+        """Restore the device snapshot saved before the last restart."""
+        if (data := await self._store.async_load()) is None:
+            return
+
+        try:
+            device = Device(**data["device"])
+        except (KeyError, TypeError) as error:
+            _LOGGER.warning("Ignoring invalid device snapshot: %s", error)
+            return
+
+        self._device = device
+        self._device_attrs = DeviceSnapshot(data.get("attrs", {}))
+        self._async_parse_bit_fields(self._device_attrs)
+        self._restored_entity_keys = {
+            platform: set(keys) for platform, keys in data.get("entity_keys", {}).items()
+        }
+        self._stale = True
+
+    def restored_entity_keys(self, platform: str) -> set[str]:
+        """Return the keys of the entities a platform had before the restart."""
+        return self._restored_entity_keys.get(platform, set())
+
+    @callback
+    def async_entity_added(self, platform: str, key: str) -> None:
+        """Remember that a platform created an entity for key."""
+        keys = self._entity_keys.setdefault(platform, set())
+        if key not in keys:
+            keys.add(key)
+            self._async_save_snapshot()
+
+    @callback
+    def _async_save_snapshot(self) -> None:
+        """Save the snapshot after SNAPSHOT_SAVE_DELAY, once for all changes until then."""
+        if self._device is None or self._snapshot_save_pending:
+            return
+        self._snapshot_save_pending = True
+        self._store.async_delay_save(self._snapshot_data, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def _snapshot_data(self) -> dict[str, Any]:
+        """Return the snapshot to save, read when the save actually happens."""
+        self._snapshot_save_pending = False
+        return {
+            "device": asdict(self._device),
+            "attrs": dict(self._device_attrs),
+            "entity_keys": {
+                platform: sorted(keys) for platform, keys in self._entity_keys.items()
+            },
+        }
+
+    @property
+    def suppressed_writes(self) -> int:
+        """Return how many state writes were skipped because nothing changed."""
+        return self._suppressed_writes
+
+    @callback
+    def record_suppressed_write(self) -> None:
+        """Count a state write skipped by an entity."""
+        self._suppressed_writes += 1
+
+    @property
+    def dropped_values(self) -> int:
+        """Return how many buffered values were overwritten before a flush."""
+        return self._dropped_values
+
+    @callback
+    def async_subscribe_attrs(
+        self,
+        keys: Iterable[str],
+        update_callback: Callable[[dict[str, Any]], None],
+    ) -> CALLBACK_TYPE:
+        """Call update_callback for frames touching any of the given keys."""
+        keys = tuple(keys)
+        for key in keys:
+            self._attr_listeners.setdefault(key, []).append(update_callback)
+
+        @callback
+        def unsubscribe() -> None:
+            for key in keys:
+                listeners = self._attr_listeners.get(key)
+                if listeners is None or update_callback not in listeners:
+                    continue
+                listeners.remove(update_callback)
+                if len(listeners) == 0:
+                    del self._attr_listeners[key]
+
+        return unsubscribe
+
+    @callback
+    def async_discover(
+        self,
+        keys: Iterable[str],
+        predicate: Callable[[Mapping[str, Any]], bool] | None,
+        on_discovered: Callable[[], None],
+    ) -> CALLBACK_TYPE:
+        """Call on_discovered if predicate holds once any of keys first appears.
+
+        The predicate sees the device attributes and is evaluated exactly once,
+        right away if a live value of a key is known, after which the discovery
+        is dropped. A predicate of None holds for any value. Restored values
+        wait for the first live snapshot. Returns a callback that cancels a
+        discovery still pending.
+        """
+        discovery = _Discovery(tuple(keys), predicate, on_discovered)
+        if not self._stale and any(key in self._device_attrs for key in discovery.keys):
+            self._async_run_discovery(discovery)
+            return lambda: None
+
+        for key in discovery.keys:
+            self._discoveries.setdefault(key, []).append(discovery)
+
+        @callback
+        def cancel() -> None:
+            self._async_remove_discovery(discovery)
+
+        return cancel
+
+    @callback
+    def _async_remove_discovery(self, discovery: _Discovery) -> None:
+        for key in discovery.keys:
+            discoveries = self._discoveries.get(key)
+            if discoveries is None or discovery not in discoveries:
+                continue
+            discoveries.remove(discovery)
+            if len(discoveries) == 0:
+                del self._discoveries[key]
+
+    @callback
+    def _async_run_discovery(self, discovery: _Discovery) -> None:
+        self._async_remove_discovery(discovery)
+        if discovery.predicate is None or discovery.predicate(self._device_attrs):
+            discovery.on_discovered()
+        else:
+            _LOGGER.warning(
+                "Missing required attributes %s of device %s, skipping",
+                discovery.keys,
+                self._device_id,
+            )
+
+    @callback
+    def _async_run_discoveries(self, device_attrs: Mapping[str, Any]) -> None:
+        """Run the discoveries triggered by the keys of a delta.
+
+        A callback may cancel other discoveries it handled along with its own,
+        those are skipped.
+        """
+        triggered: dict[_Discovery, None] = {}
+        for key in device_attrs:
+            for discovery in self._discoveries.get(key, ()):
+                triggered[discovery] = None
+        for discovery in triggered:
+            if discovery in self._discoveries.get(discovery.keys[0], ()):
+                self._async_run_discovery(discovery)
+
+    @callback
+    def _async_notify_listeners(self, device_attrs: Mapping[str, Any]) -> None:
+        """Notify each listener consuming a key of the frame exactly once."""
+        notified: dict[Callable[[dict[str, Any]], None], None] = {}
+        for key in device_attrs:
+            for listener in self._attr_listeners.get(key, ()):
+                notified[listener] = None
+
+        for listener in notified:
+            listener(device_attrs)
+
+    @callback
+    def _async_queue_update(self, device_attrs: Mapping[str, Any]) -> None:
+        """Buffer a frame until the next flush, keeping only the latest values."""
+        for key in device_attrs:
+            if key in self._pending_attrs:
+                self._dropped_values += 1
+        self._pending_attrs.update(device_attrs)
+
+        if self._flush_handle is not None:
+            return
+        if self._update_window > 0:
+            self._flush_handle = self._hass.loop.call_later(
+                self._update_window, self._async_flush_updates
+            )
+        else:
+            self._flush_handle = self._hass.loop.call_soon(self._async_flush_updates)
+
+    @callback
+    def _async_flush_updates(self) -> None:
+        """Deliver the merged delta of all buffered frames."""
+        self._flush_handle = None
+        device_attrs, self._pending_attrs = self._pending_attrs, {}
+        if len(device_attrs) == 0:
+            return
+
+        self._flush_count += 1
+        if self._flush_count % TRACE_SAMPLE_INTERVAL == 1 and _trace_enabled():
+            _TRACE_LOGGER.debug(
+                "Device %s delta #%d: %s", self._device_id, self._flush_count, device_attrs
+            )
+
+        self._async_notify_listeners(device_attrs)
+        if self._discoveries:
+            self._async_run_discoveries(device_attrs)
+        self._async_save_snapshot()
+
+    @property
+    def drift_count(self) -> int:
+        """Return how many reconciliations found attributes that had drifted."""
+        return self._drift_count
+
+    @property
+    def drifted_keys(self) -> int:
+        """Return how many attributes reconciliations had to correct in total."""
+        return self._drifted_keys
+
+    @property
+    def rejected_frames(self) -> int:
+        """Return how many frames of superseded sessions were dropped."""
+        return self._rejected_frames
+
+    def attr_last_updated(self, key: str) -> datetime | None:
+        """Return when the value of key was last received, None if restored."""
+        return self._attr_updated_at.get(key)
+
+    @callback
+    def _async_stamp_attrs(self, keys: Iterable[str]) -> None:
+        """Stamp the keys of an accepted frame with the next sequence number."""
+        self._sequence += 1
+        now = dt_util.utcnow()
+        for key in keys:
+            self._attr_sequence[key] = self._sequence
+            self._attr_updated_at[key] = now
+
+    def bit_field(self, key: str) -> int | None:
+        """Return the parsed status word of key, None if it is not known."""
+        return self._bit_fields.get(key)
+
+    @callback
+    def _async_parse_bit_fields(self, device_attrs: Mapping[str, Any]) -> None:
+        """Parse the status words of a frame for all bits read from them."""
+        for key in device_attrs:
+            if key not in BIT_FIELD_KEYS:
+                continue
+            if (value := device_attrs[key]) is None:
+                self._bit_fields.pop(key, None)
+            else:
+                self._bit_fields[key] = parse_bit_field(value)
+
+    @property
+    def unknown_attrs(self) -> Mapping[str, int]:
+        """Return how often each attribute no description knows has arrived."""
+        return self._unknown_attrs
+
+    @property
+    def dropped_unknown_attrs(self) -> int:
+        """Return how many values of unknown attributes did not fit the table."""
+        return self._dropped_unknown_attrs
+
+    @callback
+    def _async_track_unknown_attrs(
+        self, device_attrs: Mapping[str, Any]
+    ) -> Mapping[str, Any]:
+        """Count attributes no description knows and return the values to keep.
+
+        At most UNKNOWN_ATTRS_LIMIT unknown attributes are kept, values of
+        further ones are dropped. Newly seen ones are announced for sensors.
+        """
+        unknown_attrs = self._unknown_attrs
+        new_keys: list[str] = []
+        dropped: set[str] = set()
+        for key in device_attrs:
+            if key in ATTRIBUTE_KEYS:
+                continue
+            if (count := unknown_attrs.get(key)) is not None:
+                unknown_attrs[key] = count + 1
+            elif len(unknown_attrs) < UNKNOWN_ATTRS_LIMIT:
+                unknown_attrs[key] = 1
+                new_keys.append(key)
+            elif key not in self._device_attrs:
+                dropped.add(key)
+
+        if new_keys:
+            _LOGGER.debug("Device %s sent unknown attributes %s", self._device_id, new_keys)
+            async_dispatcher_send(
+                self._hass, self._signals[EVT_UNKNOWN_ATTRS], new_keys
+            )
+        if not dropped:
+            return device_attrs
+        self._dropped_unknown_attrs += len(dropped)
+        return {key: value for key, value in device_attrs.items() if key not in dropped}
+
+    @callback
+    def _async_merge_attrs(
+        self, device_attrs: Mapping[str, Any], removed: Iterable[str] = ()
+    ) -> Mapping[str, Any]:
+        """Apply a partial update of the device attributes as a new snapshot.
+
+        Returns the values that were applied, without those of unknown
+        attributes beyond UNKNOWN_ATTRS_LIMIT.
+        """
+        device_attrs = self._async_track_unknown_attrs(device_attrs)
+        self._device_attrs = self._device_attrs.merge(device_attrs, removed)
+        self._async_parse_bit_fields(device_attrs)
+        self._async_stamp_attrs(device_attrs)
+        self._async_queue_update(device_attrs)
+        return device_attrs
+
+    @callback
+    def _async_apply_snapshot(
+        self, snapshot: dict[str, Any], taken_at: int | None = None
+    ) -> Mapping[str, Any]:
+        """Merge only what differs from a full snapshot and return that delta.
+
+        Attributes missing from the snapshot are removed and delivered as None.
+        Keys updated after sequence taken_at are newer than the snapshot and kept.
+        Values of unknown attributes that do not fit the table are not part of
+        the delta, so they never count as a change.
+        """
+
+        def outdated(key: str) -> bool:
+            return taken_at is None or self._attr_sequence.get(key, 0) <= taken_at
+
+        delta = {
+            key: value
+            for key, value in snapshot.items()
+            if outdated(key)
+            and (key not in self._device_attrs or self._device_attrs[key] != value)
+        }
+        removed = [
+            key for key in self._device_attrs if key not in snapshot and outdated(key)
+        ]
+        for key in removed:
+            delta[key] = None
+
+        if len(delta) == 0:
+            return delta
+        return self._async_merge_attrs(delta, removed)
+
+    @callback
+    def _async_start_polling(self) -> None:
+        """Poll snapshots until push works again."""
+        if self.is_polling or self._device is None:
+            return
+        _LOGGER.debug("Push unavailable, polling device %s", self._device_id)
+        self._poll_interval = POLL_MIN_INTERVAL
+        self._async_schedule_poll()
+
+    @callback
+    def _async_stop_polling(self) -> None:
+        if self._cancel_poll is not None:
+            self._cancel_poll()
+            self._cancel_poll = None
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            self._poll_task = None
+        self._polled = False
+
+    @callback
+    def _async_schedule_poll(self) -> None:
+        """Schedule the next poll, never sooner than the next reconnect attempt."""
+
+        @callback
+        def poll(_now: datetime) -> None:
+            self._cancel_poll = None
+            self._poll_task = self._hass.async_create_task(self._async_poll())
 
-    async def _connect(self) -> None:
-        device_list = await self._api_client.get_device_list()
-        filtered_device_list = [device for device in device_list if device.id == self._device_id]
-        if len(filtered_device_list) == 0:
+        delay = max(self._poll_interval, self._reconnect_delay)
+        delay *= random.uniform(1, 1 + POLL_JITTER)
+        self._cancel_poll = async_call_later(self._hass, delay, poll)
+
+    async def _async_poll(self) -> None:
+        """Poll one snapshot, polling less often while the values are stable."""
+        taken_at = self._sequence
+        try:
+            device_attrs = await self._async_fetch_snapshot()
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:  # pylint: disable=broad-except
+            _LOGGER.debug("Polling device %s failed: %s", self._device_id, error)
+            device_attrs = None
+        finally:
+            self._poll_task = None
+
+        if device_attrs is None:
+            changed: Mapping[str, Any] = {}
+            self._async_set_polled(False)
+        else:
+            changed = self._async_apply_snapshot(device_attrs, taken_at)
+            self._async_set_polled(True)
+            # The websocket works again, so stop waiting out the backoff.
+            self._async_wake()
+
+        if len(changed) > 0:
+            self._poll_interval = POLL_MIN_INTERVAL
+        else:
+            self._poll_interval = min(self._poll_interval * 2, POLL_MAX_INTERVAL)
+        self._async_schedule_poll()
+
+    @callback
+    def _async_set_polled(self, polled: bool) -> None:
+        """Track whether polling delivers data and announce availability changes."""
+        if polled == self._polled:
+            return
+        self._polled = polled
+        async_dispatcher_send(
+            self._hass, self._signals[EVT_CONNECTION_STATE], self._state
+        )
+
+    @callback
+    def _async_schedule_reconcile(self) -> None:
+        self._async_cancel_reconcile()
+
+        @callback
+        def reconcile(_now: datetime) -> None:
+            self._cancel_reconcile = None
+            self._reconcile_task = self._hass.async_create_task(self._async_reconcile())
+
+        self._cancel_reconcile = async_call_later(
+            self._hass, RECONCILE_INTERVAL, reconcile
+        )
+
+    @callback
+    def _async_cancel_reconcile(self) -> None:
+        if self._cancel_reconcile is not None:
+            self._cancel_reconcile()
+            self._cancel_reconcile = None
+        if self._reconcile_task is not None:
+            self._reconcile_task.cancel()
+            self._reconcile_task = None
+
+    async def _async_reconcile(self) -> None:
+        """Correct attributes that drifted because partial frames were missed."""
+        taken_at = self._sequence
+        try:
+            snapshot = await self._async_fetch_snapshot()
+        except Exception as error:  # pylint: disable=broad-except
+            _LOGGER.debug("Reconciling device %s failed: %s", self._device_id, error)
+            snapshot = None
+        finally:
+            self._reconcile_task = None
+
+        if snapshot is not None:
+            delta = self._async_apply_snapshot(snapshot, taken_at)
+            if len(delta) > 0:
+                self._drift_count += 1
+                self._drifted_keys += len(delta)
+                _LOGGER.info(
+                    "Corrected %d drifted attributes of device %s (%d times so far): %s",
+                    len(delta),
+                    self._device_id,
+                    self._drift_count,
+                    sorted(delta),
+                )
+
+        if self._state == CONNECTION_SUBSCRIBED:
+            self._async_schedule_reconcile()
+
+    async def _async_fetch_snapshot(self) -> dict[str, Any] | None:
+        """Return all device attributes from a short-lived websocket session.
+
+        The API has no status endpoint, so this subscribes and closes again
+        after the first snapshot. Returns None when none arrived in time.
+        """
+        if self._device is None:
+            return None
+
+        snapshot: asyncio.Future[dict[str, Any]] = self._hass.loop.create_future()
+        websocket_client = VaillantWebsocketClient(
+            token=self.token,
+            device=self._device,
+            session=get_aiohttp_session(self._hass),
+            max_retry_attemps=0,
+        )
+
+        @callback
+        def device_connected(device_attrs: dict[str, Any]) -> None:
+            if not snapshot.done():
+                snapshot.set_result(device_attrs.copy())
+
+        websocket_client.on_subscribe(device_connected)
+        connect_task = self._hass.async_create_task(websocket_client.connect())
+        try:
+            done, _ = await asyncio.wait(
+                (snapshot, connect_task),
+                timeout=SNAPSHOT_TIMEOUT,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            try:
+                await websocket_client.close()
+            except Exception:  # pylint: disable=broad-except
+                pass
+            if connect_task.done() and not connect_task.cancelled():
+                # Failures only mean there is no snapshot this time.
+                connect_task.exception()
+            connect_task.cancel()
+
+        if snapshot in done:
+            return snapshot.result()
+        return None
+
+    async def _find_device(self) -> Device | None:
+        """Return this client's device from the account's device list."""
+        for device in await self._account.async_get_device_list():
+            if device.id == self._device_id:
+                return device
+        return None
+
+    async def _async_resolve_device(self) -> None:
+        """Look up this client's device unless the cached one is still fresh."""
+        if (
+            self._device is not None
+            and self._device_resolved_at is not None
+            and monotonic() - self._device_resolved_at < DEVICE_LIST_TTL
+        ):
+            return
+
+        device = await self._find_device()
+        if device is None:
+            # The cached list may predate binding this device.
+            self._account.async_invalidate_device_list()
+            device = await self._find_device()
+        if device is None:
             raise ShouldUpdateConfigEntry
 
-        self._device = filtered_device_list[0]
+        self._device = device
+        self._device_resolved_at = monotonic()
+
+    @callback
+    def _async_invalidate_device(self) -> None:
+        """Resolve the device from a fresh device list on the next connect."""
+        self._device_resolved_at = None
+        self._account.async_invalidate_device_list()
+
+    async def _connect(self) -> bool:
+        await self._async_resolve_device()
 
         if self._websocket_client is not None:
             try:
@@ -72,68 +928,202 @@ class VaillantClient:
             except Exception:
                 pass
 
+        self._generation += 1
+        generation = self._generation
+        subscribed = False
+
+        def superseded() -> bool:
+            if generation == self._generation:
+                return False
+            self._rejected_frames += 1
+            _LOGGER.debug("Dropping frame of superseded session %d", generation)
+            return True
+
+        # The library passes the subscribe snapshot to the update handler again.
+        replayed_snapshot: dict[str, Any] | None = None
+
         @callback
         def device_connected(device_attrs: dict[str, Any]):
-            self._device_attrs = device_attrs.copy()
-            async_dispatcher_send(
-                self._hass, EVT_DEVICE_CONNECTED.format(self._device_id), device_attrs.copy()
-            )
+            nonlocal subscribed, replayed_snapshot
+            if superseded():
+                return
+            subscribed = True
+            replayed_snapshot = device_attrs
+            self._async_record_frame(first=True)
+            self._async_set_connection_state(CONNECTION_SUBSCRIBED)
+
+            if len(self._device_attrs) == 0:
+                device_attrs = self._async_track_unknown_attrs(device_attrs)
+                self._device_attrs = DeviceSnapshot(device_attrs)
+                self._async_parse_bit_fields(self._device_attrs)
+                self._async_stamp_attrs(self._device_attrs)
+                self._async_queue_update(self._device_attrs)
+            else:
+                # Only replay what changed while disconnected.
+                self._async_apply_snapshot(device_attrs)
+            if self._stale:
+                # Replace the restored values shown by entities created at startup
+                # and discover the rest, including values that did not change.
+                self._stale = False
+                self._async_notify_listeners(self._device_attrs)
+                self._async_run_discoveries(self._device_attrs)
+            self._async_save_snapshot()
 
         @callback
         def device_update(event: str, data: dict[str, Any]):
+            nonlocal replayed_snapshot
             if event == EVT_DEVICE_ATTR_UPDATE:
+                if superseded():
+                    return
                 device_attrs: dict[str, Any] = data.get("data", {})
+                self._async_record_frame()
+                if replayed_snapshot is not None:
+                    replayed, replayed_snapshot = replayed_snapshot, None
+                    if device_attrs is replayed or device_attrs == replayed:
+                        return
                 if len(device_attrs) > 0:
-                    self._device_attrs.update(device_attrs)
-                    async_dispatcher_send(
-                        self._hass, EVT_DEVICE_UPDATED.format(self._device.id), device_attrs.copy()
-                    )
+                    self._async_merge_attrs(device_attrs)
+
+        @callback
+        def heartbeat() -> None:
+            if generation == self._generation:
+                self._async_record_heartbeat()
 
-        self._websocket_client = VaillantWebsocketClient(
-            token=self._token,
+        self._websocket_client = _HeartbeatWebsocketClient(
+            token=self.token,
             device=self._device,
             session=get_aiohttp_session(self._hass),
+            # Fail fast instead of sleeping inside the library, start() owns the backoff.
+            max_retry_attemps=0,
+            heartbeat_interval=LIVENESS_HEARTBEAT_INTERVAL,
+            on_heartbeat=heartbeat,
         )
         self._websocket_client.on_subscribe(device_connected)
         self._websocket_client.on_update(device_update)
 
         await self._websocket_client.connect()
 
+        # Network failures and refused sessions stop the client. A session the
+        # server closed without ever subscribing points at outdated device data.
+        if not subscribed and self._websocket_client.state == STATE_CONNECTED:
+            _LOGGER.debug("Websocket closed before subscribing, refreshing device data")
+            self._async_invalidate_device()
+
+        return subscribed
+
+    @property
+    def token(self) -> Token:
+        return self._account.token
+
     async def _get_token(self) -> None:
-        _LOGGER.info("Token expired, retrieve new token...")
-        token_new = await self._api_client.login(self._token.username, self._token.password)
-        self._token = token_new
-        self._api_client.update_token(token_new)
-        async_dispatcher_send(
-            self._hass, EVT_TOKEN_UPDATED.format(token_new.username), token_new
-        )
+        """Refresh the token of the account this device belongs to."""
+        await self._account.async_refresh_token()
 
     async def start(self) -> None:
-        """Start connection to cloud."""
-        retry_delay = 5
-        max_delay = 300  # 5 minutes max
-        while self._state != "CLOSED":
-            try:
-                await self._connect()
-                retry_delay = 5  # Reset on success
-            except InvalidAuthError:
-                await self._get_token()
-            except ShouldUpdateConfigEntry:
-                _LOGGER.error("Device not found, config entry needs update")
-                break
-            except Exception as error:
-                _LOGGER.warning(
-                    "Unhandled client exception: %s, retrying in %ds",
-                    error,
-                    retry_delay,
-                )
-                retry_delay = min(retry_delay * 2, max_delay)
+        """Start connection to cloud.
+
+        Reconnects as soon as a session ends. After a session that stayed
+        subscribed for HEALTHY_SESSION_DURATION the reconnect only waits for a
+        short spread. Failed attempts and sessions dropped right after
+        subscribing back off with decorrelated jitter up to RECONNECT_MAX_DELAY.
+        """
+        self._account.async_client_started()
+        try:
+            while self._state != CONNECTION_CLOSED:
+                if self._state != CONNECTION_DEGRADED:
+                    self._async_set_connection_state(CONNECTION_CONNECTING)
+
+                subscribed = False
+                try:
+                    subscribed = await self._connect()
+                except InvalidAuthError:
+                    await self._get_token()
+                except ShouldUpdateConfigEntry:
+                    _LOGGER.error("Device not found, config entry needs update")
+                    break
+                except Exception as error:  # pylint: disable=broad-except
+                    _LOGGER.warning("Unhandled client exception: %s", error)
+
+                if self._state == CONNECTION_CLOSED:
+                    break
+
+                if subscribed and self._session_was_healthy():
+                    self._reconnect_delay = 0.0
+                    self._async_set_connection_state(CONNECTION_DEGRADED)
+                    delay = random.uniform(0, RECONNECT_SPREAD)
+                else:
+                    delay = self._next_reconnect_delay()
+                    self._async_set_connection_state(CONNECTION_BACKOFF)
+                    _LOGGER.debug("Reconnecting in %.1fs", delay)
+
+                await self._async_sleep(delay)
+        except asyncio.CancelledError:
+            if self._state != CONNECTION_CLOSED:
+                raise
+        finally:
+            # A missing device or a failed token refresh ends the loop for good,
+            # entities must not keep showing restored values then.
+            self._async_set_connection_state(CONNECTION_CLOSED)
+            self._async_cancel_watchdog()
+            self._async_cancel_reconcile()
+            self._async_stop_polling()
+            self._account.async_client_stopped()
 
-            self._sleep_task = asyncio.create_task(asyncio.sleep(retry_delay))
+    async def _async_sleep(self, delay: float) -> None:
+        """Wait delay seconds before the next attempt, or until woken."""
+        self._sleep_task = asyncio.create_task(asyncio.sleep(delay))
+        try:
             await self._sleep_task
+        except asyncio.CancelledError:
+            if not self._wake_requested:
+                raise
+        finally:
+            self._wake_requested = False
+
+    @callback
+    def _async_wake(self) -> None:
+        """Reconnect right away if start() is waiting for the next attempt."""
+        if self._sleep_task is None or self._sleep_task.done():
+            return
+        self._wake_requested = True
+        self._sleep_task.cancel()
+
+    def _session_was_healthy(self) -> bool:
+        """Return True if the last session stayed subscribed long enough."""
+        return (
+            self._subscribed_at is not None
+            and monotonic() - self._subscribed_at >= HEALTHY_SESSION_DURATION
+        )
+
+    def _next_reconnect_delay(self) -> float:
+        """Return the next decorrelated jitter backoff delay."""
+        self._reconnect_delay = min(
+            RECONNECT_MAX_DELAY,
+            random.uniform(
+                RECONNECT_BASE_DELAY,
+                max(RECONNECT_BASE_DELAY, self._reconnect_delay * 3),
+            ),
+        )
+        return self._reconnect_delay
 
     async def close(self) -> None:
         """Close connection to cloud."""
+        self._account.async_remove_client(self)
+        self._async_set_connection_state(CONNECTION_CLOSED)
+
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        if self._command_handle is not None:
+            self._command_handle.cancel()
+            self._command_handle = None
+        for waiter in self._command_waiters:
+            if not waiter.done():
+                waiter.set_result(False)
+        self._command_waiters = []
+        self._pending_commands = {}
+
         if self._websocket_client is not None:
             try:
                 await self._websocket_client.close()
@@ -147,10 +1137,52 @@ class VaillantClient:
             except asyncio.CancelledError:
                 pass
 
-        self._state = "CLOSED"
-
     async def control_device(self, attrs: dict[str, Any]) -> bool:
-        """Send command to control device."""
+        """Send command to control device.
+
+        Commands sent within the command window are merged, the last value of
+        each attribute wins, and sent as one request whose result is returned
+        to every caller.
+        """
+        self._pending_commands.update(attrs)
+        future: asyncio.Future[bool] = self._hass.loop.create_future()
+        self._command_waiters.append(future)
+
+        if self._command_handle is not None:
+            self._command_handle.cancel()
+        self._command_handle = self._hass.loop.call_later(
+            self._command_window, self._async_flush_commands
+        )
+
+        return await future
+
+    @callback
+    def _async_flush_commands(self) -> None:
+        """Send the merged pending commands."""
+        self._command_handle = None
+        attrs, self._pending_commands = self._pending_commands, {}
+        waiters, self._command_waiters = self._command_waiters, []
+        self._hass.async_create_task(self._async_send_commands(attrs, waiters))
+
+    async def _async_send_commands(
+        self, attrs: dict[str, Any], waiters: list[asyncio.Future[bool]]
+    ) -> None:
+        """Send merged commands one batch at a time and resolve their waiters."""
+        try:
+            async with self._command_lock:
+                result = await self._async_control_device(attrs)
+        except Exception as error:  # pylint: disable=broad-except
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(error)
+            return
+
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(result)
+
+    async def _async_control_device(self, attrs: dict[str, Any]) -> bool:
+        """Send one control request, refreshing the token when it expired."""
         retry_times = 0
         while retry_times < 3:
             try:
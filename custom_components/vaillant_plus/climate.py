@@ -1,6 +1,7 @@
 """The Vaillant Plus climate platform."""
 from __future__ import annotations
 
+from collections.abc import Mapping
 import logging
 from typing import Any
 
@@ -12,14 +13,14 @@ from homeassistant.components.climate.const import (
     HVACMode,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
+from homeassistant.const import ATTR_TEMPERATURE, Platform, UnitOfTemperature
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .client import VaillantClient
-from .const import CONF_DID, DISPATCHERS, DOMAIN, EVT_DEVICE_CONNECTED, EVT_DEVICE_UPDATED, API_CLIENT
+from .const import CONF_DID, DISPATCHERS, DOMAIN, API_CLIENT
 from .entity import VaillantEntity
+from .state import ATTRIBUTE_KEYS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,6 +35,14 @@ SUPPORTED_FEATURES = (
 SUPPORTED_HVAC_MODES = [HVACMode.HEAT, HVACMode.OFF]
 SUPPORTED_PRESET_MODES = [PRESET_COMFORT]
 
+DEVICE_ATTR_KEYS = (
+    "Enabled_Heating",
+    "Heating_Enable",
+    "Room_Temperature",
+    "Room_Temperature_Setpoint_Comfort",
+)
+ATTRIBUTE_KEYS.register(DEVICE_ATTR_KEYS)
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_devices: AddEntitiesCallback
@@ -45,28 +54,23 @@ async def async_setup_entry(
         entry.entry_id
     ]
 
-    added_entities = []
-
     @callback
-    def async_new_climate(device_attrs: dict[str, Any]):
+    def async_new_climate() -> None:
         _LOGGER.debug("New climate found")
-        if "climate" not in added_entities:
-            if device_attrs.get("Enabled_Heating") is not None or device_attrs.get("Heating_Enable") is not None:
-                new_devices = [VaillantClimate(client)]
-                async_add_devices(new_devices)
-                added_entities.append("climate")
-            else:
-                _LOGGER.warning(
-                    "Missing required attribute to setup Vaillant Climate. skip."
-                )
-        else:
-            _LOGGER.debug("Already added climate device. skip.")
-
-    for signal in (EVT_DEVICE_CONNECTED, EVT_DEVICE_UPDATED):
-        unsub = async_dispatcher_connect(
-            hass, signal.format(device_id), async_new_climate
-        )
-        hass.data[DOMAIN][DISPATCHERS][device_id].append(unsub)
+        async_add_devices([VaillantClimate(client)])
+        client.async_entity_added(Platform.CLIMATE, "climate")
+
+    def has_heating_enable(device_attrs: Mapping[str, Any]) -> bool:
+        return device_attrs.get("Enabled_Heating") is not None or device_attrs.get("Heating_Enable") is not None
+
+    if "climate" in client.restored_entity_keys(Platform.CLIMATE):
+        async_new_climate()
+        return True
+
+    unsub = client.async_discover(
+        ("Enabled_Heating", "Heating_Enable"), has_heating_enable, async_new_climate
+    )
+    hass.data[DOMAIN][DISPATCHERS][device_id].append(unsub)
 
     return True
 
@@ -86,10 +90,15 @@ class VaillantClimate(VaillantEntity, ClimateEntity):
         return False
 
     @property
-    def unique_id(self) -> str:
-        """Return a unique ID to use for this entity."""
+    def unique_id_suffix(self) -> str:
+        """Return what tells this entity apart from the others of the device."""
+        return "climate"
+
+    @property
+    def device_attr_keys(self) -> tuple[str, ...]:
+        """Return the device attributes this entity consumes."""
 
-        return f"{self.device.id}_climate"
+        return DEVICE_ATTR_KEYS
 
     @property
     def name(self) -> str | None:
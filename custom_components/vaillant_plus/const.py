@@ -3,6 +3,7 @@
 DOMAIN = "vaillant_plus"
 API_CLIENT = "client"
 DISPATCHERS = "dispatchers"
+ACCOUNTS = "accounts"
 
 
 CONF_USERNAME = "username"
@@ -15,9 +16,82 @@ CONF_PORT = "port"
 CONF_MAC = "mac"
 CONF_PRODUCT_NAME = "product_name"
 
-EVT_DEVICE_CONNECTED = "vaillant_plus_device.{}.connected"
-EVT_DEVICE_UPDATED = "vaillant_plus_device.{}.updated"
+ATTR_STALE = "stale"
+
+STORAGE_VERSION = 1
+# Seconds between a device snapshot change and writing it to storage.
+SNAPSHOT_SAVE_DELAY = 60
+
 EVT_TOKEN_UPDATED = "vaillant_plus_token.{}.updated"
+EVT_CONNECTION_STATE = "vaillant_plus_device.{}.connection_state"
+EVT_UNKNOWN_ATTRS = "vaillant_plus_device.{}.unknown_attrs"
+EVT_LIVENESS_CHECKED = "vaillant_plus_device.{}.liveness_checked"
+
+CONNECTION_CONNECTING = "connecting"
+CONNECTION_SUBSCRIBED = "subscribed"
+# A subscribed session ended, reconnecting right away with the last known values.
+CONNECTION_DEGRADED = "degraded"
+CONNECTION_BACKOFF = "backoff"
+CONNECTION_CLOSED = "closed"
+
+# Every this many flushed deltas is written to the opt-in payload trace logger.
+TRACE_SAMPLE_INTERVAL = 20
+
+# Seconds to merge websocket frames before notifying entities, 0 flushes once per loop tick.
+DEFAULT_UPDATE_WINDOW = 0
+
+# Seconds without new commands before the merged commands are sent to the cloud.
+DEFAULT_COMMAND_WINDOW = 0.3
+
+# The API does not report token expiry, so assume the OAuth default until one expires.
+DEFAULT_TOKEN_LIFETIME = 12 * 60 * 60
+# Shortest token lifetime we learn from, earlier failures are treated as revocations.
+MIN_TOKEN_LIFETIME = 5 * 60
+# Renew at this share of the lifetime, minus up to TOKEN_RENEW_JITTER of it.
+TOKEN_RENEW_AT = 0.8
+TOKEN_RENEW_JITTER = 0.1
+# Seconds before retrying a failed background renewal.
+TOKEN_RENEW_RETRY = 5 * 60
+
+# Decorrelated jitter backoff between failed connection attempts, in seconds.
+RECONNECT_BASE_DELAY = 2
+RECONNECT_MAX_DELAY = 5 * 60
+# Reconnects after a healthy session are spread over this many seconds.
+RECONNECT_SPREAD = 0.5
+
+# Seconds between liveness checks, which keep running once a session subscribed.
+LIVENESS_CHECK_INTERVAL = 30
+# Seconds a session must stay subscribed to reset the reconnect backoff.
+HEALTHY_SESSION_DURATION = 3 * LIVENESS_CHECK_INTERVAL
+# Seconds the library waits after a pong before its next keepalive ping. Shorter
+# than the check interval, so an answered probe is seen by the next check.
+LIVENESS_HEARTBEAT_INTERVAL = 15
+# A session is probed with a ping after this many times the largest frame gap seen
+# without hearing from it, clamped to the bounds below. Until a gap is known the
+# default is used.
+LIVENESS_GAP_FACTOR = 2
+LIVENESS_MIN_TIMEOUT = 2 * 60
+LIVENESS_MAX_TIMEOUT = 60 * 60
+LIVENESS_DEFAULT_TIMEOUT = 15 * 60
+# Seconds over which the largest frame gap seen decays to half.
+LIVENESS_GAP_HALF_LIFE = 6 * 60 * 60
+
+# Seconds between snapshot polls while push is down, doubled while nothing changes.
+POLL_MIN_INTERVAL = 30
+POLL_MAX_INTERVAL = 10 * 60
+# Polls are delayed by up to this fraction of the interval, so entries drift apart.
+POLL_JITTER = 0.2
+# Seconds a short-lived snapshot session may take.
+SNAPSHOT_TIMEOUT = 15
+
+# Seconds between full snapshots compared against the merged attributes.
+RECONCILE_INTERVAL = 60 * 60
+
+# Most attributes no entity description knows kept per device, later ones are dropped.
+UNKNOWN_ATTRS_LIMIT = 64
+
+# Seconds the device list and each client's resolved device are reused on reconnects.
+DEVICE_LIST_TTL = 60 * 60
 
 WATER_HEATER_ON = "on"
 WATER_HEATER_OFF = "off"
@@ -1,17 +1,24 @@
 """Vaillant vSMART entity classes."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+from datetime import datetime
 import logging
-from typing import Any
+from typing import Any, TypeVar
 
-from homeassistant.core import callback
+from homeassistant.core import CALLBACK_TYPE, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
-from homeassistant.helpers.entity import Entity, DeviceInfo
+from homeassistant.helpers.entity import Entity, DeviceInfo, EntityDescription
 from vaillant_plus_cn_api import Device
 
 from .client import VaillantClient
-from .const import DOMAIN, EVT_DEVICE_UPDATED
+from .const import ATTR_STALE, DOMAIN, EVT_CONNECTION_STATE
+from .state import DeviceSnapshot
 
 _LOGGER: logging.Logger = logging.getLogger(__package__)
 
+_DescriptionT = TypeVar("_DescriptionT", bound=EntityDescription)
+
 
 class VaillantEntity(Entity):
     """Base class for Vaillant entities."""
@@ -22,58 +29,130 @@ class VaillantEntity(Entity):
     ):
         """Initialize."""
         self._client = client
+        self._last_written_state: tuple[Any, ...] | None = None
+        # Formatted on first use, the device is known by then.
+        self._unique_id: str | None = None
+        self._device_info: DeviceInfo | None = None
 
     @property
-    def device_attrs(self) -> dict[str, Any]:
+    def device_attrs(self) -> DeviceSnapshot:
         return self._client.device_attrs
 
     @property
     def device(self) -> Device:
         return self._client.device
 
+    @property
+    def device_attr_keys(self) -> tuple[str, ...]:
+        """Return the device attributes this entity consumes."""
+        return ()
+
+    @property
+    def unique_id_suffix(self) -> str:
+        """Return what tells this entity apart from the others of the device."""
+        return self.entity_description.key
+
+    @property
+    def unique_id(self) -> str | None:
+        """Return a unique ID."""
+        if self._unique_id is None:
+            self._unique_id = f"{self.device.id}_{self.unique_id_suffix}"
+        return self._unique_id
+
     def get_device_attr(self, attr: str) -> Any:
         return self._client.device_attrs.get(attr)
 
+    def get_device_attr_last_updated(self, attr: str) -> datetime | None:
+        """Return when the device last reported attr."""
+        return self._client.attr_last_updated(attr)
+
     async def async_added_to_hass(self) -> None:
         """Register callbacks."""
 
         @callback
         def update(data: dict[str, Any]) -> None:
             """Update the state."""
-            _LOGGER.debug("write ha state: %s", data)
             self.update_from_latest_data(data)
-            self.async_schedule_update_ha_state()
+            self.async_write_ha_state_if_changed()
+
+        @callback
+        def connection_state_changed(_state: str) -> None:
+            """Show a lost or restored connection right away."""
+            self.async_write_ha_state_if_changed()
 
+        self.async_on_remove(
+            self._client.async_subscribe_attrs(self.device_attr_keys, update)
+        )
         self.async_on_remove(
             async_dispatcher_connect(
-                self.hass, EVT_DEVICE_UPDATED.format(self.device.id), update
+                self.hass,
+                self._client.signal(EVT_CONNECTION_STATE),
+                connection_state_changed,
             )
         )
 
         if len(self.device_attrs) > 0:
             self.update_from_latest_data(self.device_attrs)
 
+        # The platform writes the initial state right after this method returns.
+        self._last_written_state = self._visible_state()
+
+    def _visible_state(self) -> tuple[Any, ...]:
+        """Return everything that ends up in the state machine for this entity."""
+        return (
+            self.available,
+            self.state,
+            self.capability_attributes,
+            self.state_attributes,
+            self.extra_state_attributes,
+        )
+
+    @callback
+    def async_write_ha_state_if_changed(self) -> None:
+        """Write the state only if something visible changed since the last write."""
+        visible_state = self._visible_state()
+        if visible_state == self._last_written_state:
+            self._client.record_suppressed_write()
+            return
+
+        self._last_written_state = visible_state
+        self.async_schedule_update_ha_state()
+
     @property
     def should_poll(self) -> bool:
         return False
 
     @property
     def available(self) -> bool:
-        """Return True if the entity has device data from an active connection."""
-        return self._client.is_connected and len(self.device_attrs) > 0
+        """Return True if the entity has device data from an active connection.
+
+        Values restored at startup stay available, flagged stale, until the
+        first session either replaces them or fails.
+        """
+        return (self._client.is_connected or self._client.is_stale) and len(
+            self.device_attrs
+        ) > 0
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Flag values restored from before a restart until live data arrives."""
+        if self._client.is_stale:
+            return {ATTR_STALE: True}
+        return None
 
     @property
     def device_info(self) -> DeviceInfo:
         """Return all device info available for this entity."""
-
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.device.id)},
-            name=self.device.product_name,
-            model=self.device.model,
-            # sw_version=self.device.mcu_soft_version,
-            # hw_version=self.device.mcu_hard_version,
-            manufacturer="Vaillant",
-        )
+        if self._device_info is None:
+            self._device_info = DeviceInfo(
+                identifiers={(DOMAIN, self.device.id)},
+                name=self.device.product_name,
+                model=self.device.model,
+                # sw_version=self.device.mcu_soft_version,
+                # hw_version=self.device.mcu_hard_version,
+                manufacturer="Vaillant",
+            )
+        return self._device_info
 
     @callback
     def update_from_latest_data(self, data: dict[str, Any]) -> None:
@@ -84,3 +163,65 @@ class VaillantEntity(Entity):
         await self._client.control_device({
             f"{attr}": value
         })
+
+
+@callback
+def async_discover_descriptions(
+    client: VaillantClient,
+    platform: str,
+    descriptions: Iterable[_DescriptionT],
+    async_add_descriptions: Callable[[list[_DescriptionT]], None],
+    attr_of: Callable[[_DescriptionT], str] = lambda description: description.key,
+    applies: Callable[[_DescriptionT, Mapping[str, Any]], bool] | None = None,
+) -> CALLBACK_TYPE:
+    """Add the entities of descriptions once their attribute first appears.
+
+    Descriptions of entities restored from before the restart are added right
+    away. The others wait on one client discovery per attribute, and whenever
+    one fires, every description whose attribute is known by then is added in
+    one batch. If given, applies is checked once against the device attributes
+    at that point and drops the descriptions it rejects. Returns a callback
+    that cancels the discoveries still pending.
+    """
+    restored_keys = client.restored_entity_keys(platform)
+    restored: list[_DescriptionT] = []
+    pending: dict[str, list[_DescriptionT]] = {}
+    for description in descriptions:
+        if description.key in restored_keys:
+            restored.append(description)
+        else:
+            pending.setdefault(attr_of(description), []).append(description)
+    if restored:
+        async_add_descriptions(restored)
+
+    cancels: dict[str, CALLBACK_TYPE] = {}
+
+    @callback
+    def async_discovered() -> None:
+        device_attrs = client.device_attrs
+        found: list[_DescriptionT] = []
+        for attr in [attr for attr in pending if attr in device_attrs]:
+            found.extend(
+                description
+                for description in pending.pop(attr)
+                if applies is None or applies(description, device_attrs)
+            )
+            if (cancel := cancels.pop(attr, None)) is not None:
+                cancel()
+        if found:
+            async_add_descriptions(found)
+
+    for attr in list(pending):
+        if attr not in pending:
+            # Added along with an attribute discovered right away.
+            continue
+        cancel = client.async_discover((attr,), None, async_discovered)
+        if attr in pending:
+            cancels[attr] = cancel
+
+    @callback
+    def async_cancel() -> None:
+        while cancels:
+            cancels.popitem()[1]()
+
+    return async_cancel
@@ -1,7 +1,11 @@
 """Vaillant sensors."""
 from __future__ import annotations
 
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
 import logging
+from time import monotonic
 from typing import Any
 
 from homeassistant.components.sensor import (
@@ -11,313 +15,371 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfTemperature
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.const import Platform, UnitOfTemperature, UnitOfTime
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 
 from .client import VaillantClient
-from .const import CONF_DID, DISPATCHERS, DOMAIN, EVT_DEVICE_CONNECTED, API_CLIENT
-from .entity import VaillantEntity
+from .const import (
+    CONF_DID,
+    DISPATCHERS,
+    DOMAIN,
+    EVT_LIVENESS_CHECKED,
+    EVT_UNKNOWN_ATTRS,
+    API_CLIENT,
+)
+from .entity import VaillantEntity, async_discover_descriptions
+from .state import ATTRIBUTE_KEYS
 
 _LOGGER = logging.getLogger(__name__)
 
+LAST_FRAME_AGE_KEY = "last_frame_age"
+
+# Seconds after which a held back value is published even inside the deadband.
+DEFAULT_MAX_AGE = 600
+
+# Absolute deadband applied to numeric values when the description sets none.
+DEVICE_CLASS_DEADBANDS: dict[SensorDeviceClass, float] = {
+    SensorDeviceClass.TEMPERATURE: 0.2,
+    SensorDeviceClass.PRESSURE: 0.05,
+    SensorDeviceClass.SIGNAL_STRENGTH: 3,
+}
+
+
+@dataclass
+class VaillantSensorDescription(SensorEntityDescription):
+    """Describe a Vaillant sensor.
+
+    Numeric changes smaller than ``deadband`` (absolute) or ``deadband_ratio``
+    (relative to the published value) and changes arriving less than
+    ``min_interval`` seconds after the last publish are held back. A held value
+    is published anyway once the published one is ``max_age`` seconds old.
+    """
+
+    deadband: float | None = None
+    deadband_ratio: float | None = None
+    min_interval: float | None = None
+    max_age: float = DEFAULT_MAX_AGE
+
 
 SENSOR_DESCRIPTIONS = (
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="Room_Temperature_Setpoint_Comfort",
         name="Room temperature setpoint of comfort mode",
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="Room_Temperature_Setpoint_ECO",
         name="Room temperature setpoint of ECO mode",
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="Outdoor_Temperature",
         name="Outdoor temperature",
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="Room_Temperature",
         name="Room temperature",
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="DHW_setpoint",
         name="Domestic hot water setpoint",
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="DHW_readSetPoint",
         name="Domestic hot water read setpoint",
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="Lower_Limitation_of_CH_Setpoint",
         name="Lower limitation of central heating setpoint",
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="Upper_Limitation_of_CH_Setpoint",
         name="Upper limitation of central heating setpoint",
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="Lower_Limitation_of_DHW_Setpoint",
         name="Lower limitation of domestic hot water",
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="Upper_Limitation_of_DHW_Setpoint",
         name="Upper limitation of domestic hot water",
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="Current_DHW_Setpoint",
         name="Current domestic hot water setpoint",
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="Flow_Temperature_Setpoint",
         name="Flow temperature setpoint",
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="Flow_temperature",
         name="Flow temperature",
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
+        deadband=0.5,
+        min_interval=30,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="return_temperature",
         name="Return flow temperature",
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
+        deadband=0.5,
+        min_interval=30,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="Tank_temperature",
         name="Water tank temperature",
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="gas_ch_consumption_today",
         name="Central heating gas consumption today raw",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="gas_ch_consumption_yesterday",
         name="Central heating gas consumption yesterday raw",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="gas_ch_consumption_monthly",
         name="Central heating gas consumption monthly raw",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="gas_ch_consumption_yearly",
         name="Central heating gas consumption yearly raw",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="gas_dhw_consumption_today",
         name="Domestic hot water gas consumption today raw",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="gas_dhw_consumption_yesterday",
         name="Domestic hot water gas consumption yesterday raw",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="gas_dhw_consumption_monthly",
         name="Domestic hot water gas consumption monthly raw",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="gas_dhw_consumption_yearly",
         name="Domestic hot water gas consumption yearly raw",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="gas_consumption",
         name="Gas consumption raw",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="CH_workTime",
         name="Central heating work time",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="CH_startTimes",
         name="Central heating start count",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="DHW_workTime",
         name="Domestic hot water work time",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="DHW_startTimes",
         name="Domestic hot water start count",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="CH_power",
         name="Central heating power raw",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="DHW_power",
         name="Domestic hot water power raw",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="Heating_Curve",
         name="Heating curve",
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="Heating_System_Setting",
         name="Heating system setting",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="water_pressure",
         name="Water pressure",
         device_class=SensorDeviceClass.PRESSURE,
         native_unit_of_measurement="bar",
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
+        deadband=0.1,
+        min_interval=60,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="burn_status",
         name="Burn status",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="pump_status",
         name="Pump status",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="fan_status",
         name="Fan status",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="fan_speed",
         name="Fan speed",
         entity_category=EntityCategory.DIAGNOSTIC,
+        deadband_ratio=0.05,
+        min_interval=30,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="ebus_status",
         name="eBUS status",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="modbus_status",
         name="Modbus status",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="WiFi_RSSI",
         name="Wi-Fi RSSI",
         device_class=SensorDeviceClass.SIGNAL_STRENGTH,
         native_unit_of_measurement="dBm",
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
+        deadband=5,
+        min_interval=300,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="maintainence_remainTime",
         name="Maintenance remain time",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="Fault_List_1",
         name="Fault list 1",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="Fault_List_2",
         name="Fault list 2",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="Fault_List_3",
         name="Fault list 3",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="Fault_List_4",
         name="Fault list 4",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="Fault_List_5",
         name="Fault list 5",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="Gateway_Fault_List_1",
         name="Gateway fault list 1",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="Gateway_Fault_List_2",
         name="Gateway fault list 2",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="Gateway_Fault_List_3",
         name="Gateway fault list 3",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="Gateway_Fault_List_4",
         name="Gateway fault list 4",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    VaillantSensorDescription(
         key="Gateway_Fault_List_5",
         name="Gateway fault list 5",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
 )
+ATTRIBUTE_KEYS.register(description.key for description in SENSOR_DESCRIPTIONS)
+
+
+def generic_sensor_description(key: str) -> VaillantSensorDescription:
+    """Describe a sensor for an attribute no description knows yet."""
+    return VaillantSensorDescription(
+        key=key,
+        name=key,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    )
 
 
 async def async_setup_entry(
@@ -329,27 +391,48 @@ async def async_setup_entry(
         entry.entry_id
     ]
 
-    added_entities = []
+    frame_age_added = False
 
     @callback
-    def async_new_entities(device_attrs: dict[str, Any]):
-        _LOGGER.debug("add vaillant sensor entities. device attrs: %s", device_attrs)
-        new_entities = []
-        for description in SENSOR_DESCRIPTIONS:
-            if (
-                description.key in device_attrs
-                and description.key not in added_entities
-            ):
-                new_entities.append(VaillantSensorEntity(client, description))
-                added_entities.append(description.key)
-
-        if len(new_entities) > 0:
-            async_add_entities(new_entities)
+    def async_new_sensors(descriptions: list[VaillantSensorDescription]) -> None:
+        nonlocal frame_age_added
+        entities: list[SensorEntity] = []
+        for description in descriptions:
+            client.async_entity_added(Platform.SENSOR, description.key)
+            entities.append(VaillantSensorEntity(client, description))
+        if client.device is not None and not frame_age_added:
+            entities.append(VaillantLastFrameAgeSensor(client))
+            frame_age_added = True
+        async_add_entities(entities)
 
-    unsub = async_dispatcher_connect(
-        hass, EVT_DEVICE_CONNECTED.format(device_id), async_new_entities
+    unsub = async_discover_descriptions(
+        client, Platform.SENSOR, SENSOR_DESCRIPTIONS, async_new_sensors
     )
+    hass.data[DOMAIN][DISPATCHERS][device_id].append(unsub)
 
+    generic_keys: set[str] = set()
+
+    @callback
+    def async_new_generic_sensors(keys: Iterable[str]) -> None:
+        new_keys = [key for key in keys if key not in generic_keys]
+        if len(new_keys) == 0:
+            return
+        generic_keys.update(new_keys)
+        for key in new_keys:
+            client.async_entity_added(Platform.SENSOR, key)
+        async_add_entities(
+            VaillantSensorEntity(client, generic_sensor_description(key))
+            for key in new_keys
+        )
+
+    async_new_generic_sensors(
+        client.restored_entity_keys(Platform.SENSOR).difference(
+            description.key for description in SENSOR_DESCRIPTIONS
+        )
+    )
+    unsub = async_dispatcher_connect(
+        hass, client.signal(EVT_UNKNOWN_ATTRS), async_new_generic_sensors
+    )
     hass.data[DOMAIN][DISPATCHERS][device_id].append(unsub)
 
     return True
@@ -358,18 +441,33 @@ async def async_setup_entry(
 class VaillantSensorEntity(VaillantEntity, SensorEntity):
     """Define a Vaillant sensor entity."""
 
+    entity_description: VaillantSensorDescription
+
     def __init__(
         self,
         client: VaillantClient,
-        description: SensorEntityDescription,
+        description: VaillantSensorDescription,
     ):
         super().__init__(client)
         self.entity_description = description
 
+        self._deadband = description.deadband
+        if self._deadband is None and description.deadband_ratio is None:
+            self._deadband = DEVICE_CLASS_DEADBANDS.get(description.device_class)
+        self._throttled = (
+            self._deadband is not None
+            or description.deadband_ratio is not None
+            or description.min_interval is not None
+        )
+        self._published = False
+        self._published_at = 0.0
+        self._held_value: Any = None
+        self._cancel_held_timer: CALLBACK_TYPE | None = None
+
     @property
-    def unique_id(self) -> str | None:
-        """Return a unique ID."""
-        return f"{self.device.id}_{self.entity_description.key}"
+    def device_attr_keys(self) -> tuple[str, ...]:
+        """Return the device attributes this entity consumes."""
+        return (self.entity_description.key,)
 
     @callback
     def update_from_latest_data(self, data: dict[str, Any]) -> None:
@@ -378,5 +476,130 @@ class VaillantSensorEntity(VaillantEntity, SensorEntity):
             return
 
         value = data.get(self.entity_description.key)
+        if self._throttled and not self._should_publish(value):
+            return
+
+        self._publish(value)
+
+    @callback
+    def _publish(self, value: Any) -> None:
+        """Make value the native value of this sensor."""
+        self._cancel_hold()
         self._attr_native_value = value
         self._attr_available = value is not None
+        self._published = True
+        self._published_at = monotonic()
+
+    def _should_publish(self, value: Any) -> bool:
+        """Return False and hold value back if it is within the deadband or too early."""
+        published = self._attr_native_value
+        if (
+            not self._published
+            or not _is_number(value)
+            or not _is_number(published)
+        ):
+            return True
+
+        if value == published:
+            self._cancel_hold()
+            return False
+
+        age = monotonic() - self._published_at
+        max_age = self.entity_description.max_age
+        if age >= max_age:
+            return True
+
+        min_interval = self.entity_description.min_interval
+        if min_interval is not None and age < min_interval:
+            self._hold(value, min_interval - age)
+            return False
+
+        if abs(value - published) < self._threshold(published):
+            self._hold(value, max_age - age)
+            return False
+
+        return True
+
+    def _threshold(self, published: float) -> float:
+        """Return the smallest change that is published immediately."""
+        threshold = self._deadband or 0
+        if self.entity_description.deadband_ratio is not None:
+            threshold = max(
+                threshold, abs(published) * self.entity_description.deadband_ratio
+            )
+        return threshold
+
+    @callback
+    def _hold(self, value: Any, delay: float) -> None:
+        """Keep value back and publish it after delay seconds."""
+        self._held_value = value
+        if self._cancel_held_timer is not None or self.hass is None:
+            return
+        self._cancel_held_timer = async_call_later(
+            self.hass, delay, self._async_publish_held
+        )
+
+    @callback
+    def _cancel_hold(self) -> None:
+        """Drop the held value and its timer."""
+        self._held_value = None
+        if self._cancel_held_timer is not None:
+            self._cancel_held_timer()
+            self._cancel_held_timer = None
+
+    @callback
+    def _async_publish_held(self, _now: datetime) -> None:
+        """Publish the value held back by the deadband or minimum interval."""
+        self._cancel_held_timer = None
+        value = self._held_value
+        if value is None or not self._should_publish(value):
+            return
+        self._publish(value)
+        self.async_write_ha_state_if_changed()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel a pending publish of a held value."""
+        self._cancel_hold()
+
+
+class VaillantLastFrameAgeSensor(VaillantEntity, SensorEntity):
+    """Seconds since the last frame of the websocket session."""
+
+    entity_description = SensorEntityDescription(
+        key=LAST_FRAME_AGE_KEY,
+        name="Last frame age",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    )
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the liveness checks, which keep running without frames."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                self._client.signal(EVT_LIVENESS_CHECKED),
+                self.async_write_ha_state_if_changed,
+            )
+        )
+
+    @property
+    def available(self) -> bool:
+        """The age is most telling while the connection is down."""
+        return True
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the age of the last frame."""
+        age = self._client.last_frame_age
+        if age is None:
+            return None
+        return round(age)
+
+
+def _is_number(value: Any) -> bool:
+    """Return True for int and float values, bool excluded."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
@@ -0,0 +1,99 @@
+"""Immutable snapshots of the device attributes."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any, NoReturn
+
+
+class AttributeKeyTable:
+    """Attribute keys read by the platform descriptions.
+
+    Platforms register the keys of their descriptions on import. Keys the
+    device sends that nobody registered are reported as unknown attributes.
+    """
+
+    __slots__ = ("_keys",)
+
+    def __init__(self) -> None:
+        self._keys: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def register(self, keys: Iterable[str]) -> None:
+        """Add the keys of a platform's descriptions."""
+        self._keys.update(keys)
+
+
+ATTRIBUTE_KEYS = AttributeKeyTable()
+
+# Attributes sent as status words of "1" and "0" characters. The client parses
+# these once per frame, restored ones before any platform is set up, so the
+# keys are fixed here instead of being registered by the platforms.
+BIT_FIELD_KEYS: frozenset[str] = frozenset({"Boiler_info3_bit0", "Boiler_info5_bit4"})
+
+
+def parse_bit_field(value: Any) -> int:
+    """Return a status word as an integer, character i being bit i.
+
+    The gateway sends the words as strings or integers, any character other
+    than "1" counts as a cleared bit.
+    """
+    text = str(value)
+    try:
+        return int(text[::-1], 2)
+    except ValueError:
+        return sum(1 << bit for bit, char in enumerate(text) if char == "1")
+
+
+def _immutable(*_args: Any, **_kwargs: Any) -> NoReturn:
+    raise TypeError("DeviceSnapshot is immutable, merge() returns the next version")
+
+
+class DeviceSnapshot(dict[str, Any]):
+    """The device attributes at one version, never changed after creation.
+
+    The client replaces its snapshot for every accepted frame and hands the
+    same object to every reader, so reads need no copies or locks. Reads are
+    the inherited dict methods and run at C level, only the methods that
+    would change the snapshot are blocked.
+    """
+
+    __slots__ = ("_version",)
+
+    _version: int
+
+    def __init__(self, data: Mapping[str, Any] | None = None, version: int = 0) -> None:
+        if data is not None:
+            dict.update(self, data)
+        self._version = version
+
+    @property
+    def version(self) -> int:
+        """Return the number of merges this snapshot is the result of."""
+        return self._version
+
+    def merge(
+        self, delta: Mapping[str, Any], removed: Iterable[str] = ()
+    ) -> DeviceSnapshot:
+        """Return the next version with delta applied and removed keys dropped."""
+        snapshot = DeviceSnapshot(self, self._version + 1)
+        dict.update(snapshot, delta)
+        for key in removed:
+            dict.pop(snapshot, key, None)
+        return snapshot
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (DeviceSnapshot, (dict(self), self._version))
+
+    def __repr__(self) -> str:
+        return f"DeviceSnapshot(version={self._version}, {dict.__repr__(self)})"
@@ -1,6 +1,7 @@
 """The Vaillant Plus water heater platform."""
 from __future__ import annotations
 
+from collections.abc import Mapping
 import logging
 from typing import Any
 
@@ -9,9 +10,8 @@ from homeassistant.components.water_heater import (
     WaterHeaterEntityFeature,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import ATTR_TEMPERATURE, PRECISION_HALVES, UnitOfTemperature
+from homeassistant.const import ATTR_TEMPERATURE, PRECISION_HALVES, Platform, UnitOfTemperature
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .client import VaillantClient
@@ -19,12 +19,12 @@ from .const import (
     CONF_DID,
     DISPATCHERS,
     DOMAIN,
-    EVT_DEVICE_CONNECTED,
     WATER_HEATER_OFF,
     WATER_HEATER_ON,
     API_CLIENT,
 )
 from .entity import VaillantEntity
+from .state import ATTRIBUTE_KEYS
 
 # from .entity import VaillantCoordinator, VaillantEntity
 
@@ -37,6 +37,20 @@ SUPPORTED_FEATURES = (
     | WaterHeaterEntityFeature.OPERATION_MODE
 )
 
+DEVICE_ATTR_KEYS = (
+    "WarmStar_Tank_Loading_Enable",
+    "Enabled_DHW",
+    "DHW_switch",
+    "Tank_temperature",
+    "Flow_temperature",
+    "Current_DHW_Setpoint",
+    "DHW_readSetPoint",
+    "DHW_setpoint",
+    "Upper_Limitation_of_DHW_Setpoint",
+    "Lower_Limitation_of_DHW_Setpoint",
+)
+ATTRIBUTE_KEYS.register(DEVICE_ATTR_KEYS)
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_devices: AddEntitiesCallback
@@ -48,27 +62,22 @@ async def async_setup_entry(
         entry.entry_id
     ]
 
-    added_entities = []
-
     @callback
-    def async_new_water_heater(device_attrs: dict[str, Any]):
-        _LOGGER.debug("New water heater found, %s", device_attrs)
-        if "water_heater" not in added_entities:
-            if device_attrs.get("DHW_setpoint") is not None:
-                new_devices = [VaillantWaterHeater(client)]
-                async_add_devices(new_devices)
-                added_entities.append("water_heater")
-            else:
-                _LOGGER.warning(
-                    "Missing required attribute to setup Vaillant Water Heater. skip."
-                )
-        else:
-            _LOGGER.debug("Already added water_heater device. skip.")
-
-    unsub = async_dispatcher_connect(
-        hass, EVT_DEVICE_CONNECTED.format(device_id), async_new_water_heater
-    )
+    def async_new_water_heater() -> None:
+        _LOGGER.debug("New water heater found")
+        async_add_devices([VaillantWaterHeater(client)])
+        client.async_entity_added(Platform.WATER_HEATER, "water_heater")
+
+    def has_dhw_setpoint(device_attrs: Mapping[str, Any]) -> bool:
+        return device_attrs.get("DHW_setpoint") is not None
 
+    if "water_heater" in client.restored_entity_keys(Platform.WATER_HEATER):
+        async_new_water_heater()
+        return True
+
+    unsub = client.async_discover(
+        ("DHW_setpoint",), has_dhw_setpoint, async_new_water_heater
+    )
     hass.data[DOMAIN][DISPATCHERS][device_id].append(unsub)
 
     return True
@@ -94,10 +103,15 @@ class VaillantWaterHeater(VaillantEntity, WaterHeaterEntity):
         return False
 
     @property
-    def unique_id(self) -> str:
-        """Return a unique ID to use for this entity."""
+    def unique_id_suffix(self) -> str:
+        """Return what tells this entity apart from the others of the device."""
+        return "water_heater"
+
+    @property
+    def device_attr_keys(self) -> tuple[str, ...]:
+        """Return the device attributes this entity consumes."""
 
-        return f"{self.device.id}_water_heater"
+        return DEVICE_ATTR_KEYS
 
     @property
     def name(self) -> str | None:
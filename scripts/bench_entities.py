@@ -0,0 +1,159 @@
+"""Measure the per-frame entity overhead saved by caching and sampled tracing.
+
+Seventy entities are fed the same frame, once the way entities behaved before
+(payload debug log per entity, signal formatted per frame, unique_id and
+device_info built per access) and once the way they behave now.
+
+Run from the repository root:
+
+    python scripts/bench_entities.py
+"""
+from __future__ import annotations
+
+import io
+import logging
+from pathlib import Path
+import sys
+from types import SimpleNamespace
+import timeit
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from homeassistant.helpers.entity import DeviceInfo  # noqa: E402
+from vaillant_plus_cn_api import Device  # noqa: E402
+
+from custom_components.vaillant_plus.binary_sensor import (  # noqa: E402
+    BINARY_SENSOR_DESCRIPTIONS,
+    VaillantBinarySensorEntity,
+)
+from custom_components.vaillant_plus.const import DOMAIN  # noqa: E402
+from custom_components.vaillant_plus.sensor import (  # noqa: E402
+    SENSOR_DESCRIPTIONS,
+    VaillantSensorEntity,
+    generic_sensor_description,
+)
+from custom_components.vaillant_plus.state import DeviceSnapshot  # noqa: E402
+
+ENTITIES = 70
+NUMBER = 2_000
+
+_LOGGER = logging.getLogger("custom_components.vaillant_plus")
+
+# The per-device signal every frame used to be dispatched on.
+_OLD_UPDATED_SIGNAL = "vaillant_plus_device.{}.updated"
+
+DEVICE = Device(
+    id="1",
+    mac="mac",
+    product_key="pk",
+    product_id=1,
+    product_name="pn",
+    product_verbose_name="pvn",
+    is_online=True,
+    is_manager=True,
+    group_id=1,
+    sno="sno",
+    create_time="2000-01-01 00:00:00",
+    model_alias="alias",
+    model="model",
+    serial_number="s1",
+)
+
+
+def _entities() -> list:
+    # Entities only read device and device_attrs from their client here.
+    client = SimpleNamespace(device=DEVICE, device_attrs=DeviceSnapshot())
+    entities: list = [
+        VaillantSensorEntity(client, description) for description in SENSOR_DESCRIPTIONS
+    ]
+    entities.extend(
+        VaillantBinarySensorEntity(client, description)
+        for description in BINARY_SENSOR_DESCRIPTIONS
+        if description.bit is None
+    )
+    index = 0
+    while len(entities) < ENTITIES:
+        entities.append(
+            VaillantSensorEntity(client, generic_sensor_description(f"Unknown_{index}"))
+        )
+        index += 1
+    return entities[:ENTITIES]
+
+
+def _frame(entities: list) -> dict:
+    return {entity.device_attr_keys[0]: 1 for entity in entities}
+
+
+def _old_frame(entities: list, frame: dict) -> None:
+    _OLD_UPDATED_SIGNAL.format(DEVICE.id)
+    for entity in entities:
+        _LOGGER.debug("write ha state: %s", frame)
+        entity.update_from_latest_data(frame)
+
+
+def _new_frame(entities: list, frame: dict) -> None:
+    for entity in entities:
+        entity.update_from_latest_data(frame)
+
+
+def _old_identity(entities: list) -> None:
+    for entity in entities:
+        f"{entity.device.id}_{entity.entity_description.key}"  # noqa: B018
+        DeviceInfo(
+            identifiers={(DOMAIN, entity.device.id)},
+            name=entity.device.product_name,
+            model=entity.device.model,
+            manufacturer="Vaillant",
+        )
+
+
+def _new_identity(entities: list) -> None:
+    for entity in entities:
+        entity.unique_id  # noqa: B018
+        entity.device_info  # noqa: B018
+
+
+def _bench(name: str, old, new) -> None:
+    old_seconds = min(timeit.repeat(old, number=NUMBER, repeat=5)) / NUMBER
+    new_seconds = min(timeit.repeat(new, number=NUMBER, repeat=5)) / NUMBER
+    print(
+        f"{name:<28} {old_seconds * 1e6:9.1f} us {new_seconds * 1e6:9.1f} us"
+        f" {(old_seconds - new_seconds) * 1e6:9.1f} us"
+    )
+
+
+def main() -> None:
+    entities = _entities()
+    frame = _frame(entities)
+
+    print(f"{len(entities)} entities, {len(frame)} attributes per frame\n")
+    print(f"{'':<28} {'before':>12} {'after':>12} {'saved':>12}")
+
+    _LOGGER.setLevel(logging.INFO)
+    _bench(
+        "frame, debug logging off",
+        lambda: _old_frame(entities, frame),
+        lambda: _new_frame(entities, frame),
+    )
+
+    # Debug logging of the integration turned on, written to memory.
+    handler = logging.StreamHandler(io.StringIO())
+    _LOGGER.addHandler(handler)
+    _LOGGER.setLevel(logging.DEBUG)
+    _LOGGER.propagate = False
+    _bench(
+        "frame, debug logging on",
+        lambda: _old_frame(entities, frame),
+        lambda: _new_frame(entities, frame),
+    )
+    _LOGGER.removeHandler(handler)
+
+    _bench(
+        "unique_id and device_info",
+        lambda: _old_identity(entities),
+        lambda: _new_identity(entities),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -204,7 +204,7 @@ async def device_api_client_fixture(hass):
         "vaillant_plus_cn_api.VaillantApiClient",
         return_value=mock_api_client,
     ), patch(
-        "custom_components.vaillant_plus.client.VaillantApiClient",
+        "custom_components.vaillant_plus.account.VaillantApiClient",
         return_value=mock_api_client,
     ):
         device_api_client = VaillantClient(
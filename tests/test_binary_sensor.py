@@ -4,11 +4,23 @@ from homeassistant.components.binary_sensor import BinarySensorDeviceClass
 from homeassistant.helpers.entity import EntityCategory
 
 from custom_components.vaillant_plus.binary_sensor import (
+    BINARY_SENSOR_DESCRIPTIONS,
+    STATUS_WORD_MAX_BITS,
     VaillantBinarySensorDescription,
     VaillantBinarySensorEntity,
+    bit_field_decoder,
+    enum_decoder,
+    has_status_word_bit,
+    truthy_decoder,
 )
 
 
+def update_bit_field(client, binary_sensor, data):
+    """Deliver a frame the way the client does, parsing status words first."""
+    client._async_merge_attrs(data)
+    binary_sensor.update_from_latest_data(data)
+
+
 async def test_binary_sensor_heating_enabled(device_api_client):
     """Test binary sensor."""
     binary_sensor = VaillantBinarySensorEntity(
@@ -71,13 +83,13 @@ async def test_binary_sensor_boiler_info3_bit0(device_api_client):
 
     assert binary_sensor.unique_id == "1_Boiler_info3_bit0"
 
-    binary_sensor.update_from_latest_data({"Boiler_info3_bit0": "10"})
+    update_bit_field(device_api_client, binary_sensor, {"Boiler_info3_bit0": "10"})
     assert binary_sensor.is_on is True
 
-    binary_sensor.update_from_latest_data({"Boiler_info3_bit0": "00"})
+    update_bit_field(device_api_client, binary_sensor, {"Boiler_info3_bit0": "00"})
     assert binary_sensor.is_on is False
 
-    binary_sensor.update_from_latest_data({"Boiler_info3_bit0": "000"})
+    update_bit_field(device_api_client, binary_sensor, {"Boiler_info3_bit0": "000"})
     assert binary_sensor.is_on is False
 
 
@@ -96,11 +108,86 @@ async def test_binary_sensor_boiler_info5_bit4(device_api_client):
 
     assert binary_sensor.unique_id == "1_Boiler_info5_bit4"
 
-    binary_sensor.update_from_latest_data({"Boiler_info5_bit4": "10"})
+    update_bit_field(device_api_client, binary_sensor, {"Boiler_info5_bit4": "10"})
     assert binary_sensor.is_on is True
 
-    binary_sensor.update_from_latest_data({"Boiler_info5_bit4": "00"})
+    update_bit_field(device_api_client, binary_sensor, {"Boiler_info5_bit4": "00"})
     assert binary_sensor.is_on is False
 
-    binary_sensor.update_from_latest_data({"Boiler_info5_bit4": "000"})
+    update_bit_field(device_api_client, binary_sensor, {"Boiler_info5_bit4": "000"})
     assert binary_sensor.is_on is False
+
+
+async def test_binary_sensor_descriptions_compile_decoders(device_api_client):
+    """Test every description carries its decoder."""
+    assert all(
+        description.decoder is not None
+        for description in BINARY_SENSOR_DESCRIPTIONS
+    )
+    assert bit_field_decoder(0)(0b1) is True
+    assert bit_field_decoder(2)(0b100) is True
+    assert bit_field_decoder(2)(0b10) is False
+    assert enum_decoder(2, 3)(2) is True
+    assert truthy_decoder(0) is False
+
+    binary_sensor = VaillantBinarySensorEntity(
+        device_api_client,
+        VaillantBinarySensorDescription(
+            key="Heating_Enable",
+            name="Heating",
+            on_state=1,
+            decoder=enum_decoder(1, 2),
+        ),
+    )
+
+    binary_sensor.update_from_latest_data({"Heating_Enable": 2})
+    assert binary_sensor.is_on is True
+
+
+async def test_binary_sensor_status_word_bits(device_api_client):
+    """Test undocumented status bits are read from the parsed word."""
+    bits = [
+        description
+        for description in BINARY_SENSOR_DESCRIPTIONS
+        if description.attr == "Boiler_info3_bit0"
+    ]
+    assert [description.bit for description in bits] == list(
+        range(STATUS_WORD_MAX_BITS)
+    )
+    assert bits[1].key == "Boiler_info3_word_bit1"
+    assert bits[1].name == "Boiler heating demand word bit 1"
+    assert bits[1].entity_registry_enabled_default is False
+
+    # Only the bits of the word the device sends get entities.
+    assert [
+        description.bit
+        for description in bits
+        if has_status_word_bit(description, {"Boiler_info3_bit0": "000"})
+    ] == [0, 1, 2]
+    assert [
+        description.bit
+        for description in bits
+        if has_status_word_bit(description, {"Boiler_info3_bit0": ""})
+    ] == [0]
+
+    first, second = (
+        VaillantBinarySensorEntity(device_api_client, description)
+        for description in bits[:2]
+    )
+    assert first.device_attr_keys == second.device_attr_keys == ("Boiler_info3_bit0",)
+
+    update_bit_field(device_api_client, first, {"Boiler_info3_bit0": 1})
+    second.update_from_latest_data({"Boiler_info3_bit0": 1})
+    assert device_api_client.bit_field("Boiler_info3_bit0") == 0b01
+    assert first.is_on is True
+    assert second.is_on is False
+
+    update_bit_field(device_api_client, first, {"Boiler_info3_bit0": "01"})
+    second.update_from_latest_data({"Boiler_info3_bit0": "01"})
+    assert first.is_on is False
+    assert second.is_on is True
+
+    # A word the client has not parsed leaves the bit unknown.
+    device_api_client._bit_fields.clear()
+    first.update_from_latest_data({"Boiler_info3_bit0": "01"})
+    assert first.is_on is None
@@ -2,12 +2,48 @@
 import pytest
 import logging
 import asyncio
-from vaillant_plus_cn_api import Token
+from datetime import timedelta
+from time import monotonic
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+from vaillant_plus_cn_api import (
+    EVT_DEVICE_ATTR_UPDATE,
+    STATE_CONNECTED,
+    STATE_STOPPED,
+    Token,
+    VaillantWebsocketClient,
+)
 
 from custom_components.vaillant_plus.client import (
     # ShouldUpdateConfigEntry,
     VaillantClient,
 )
+from custom_components.vaillant_plus.state import AttributeKeyTable, DeviceSnapshot
+from custom_components.vaillant_plus.const import (
+    ACCOUNTS,
+    CONNECTION_BACKOFF,
+    CONNECTION_CLOSED,
+    CONNECTION_CONNECTING,
+    CONNECTION_DEGRADED,
+    CONNECTION_SUBSCRIBED,
+    DOMAIN,
+    EVT_CONNECTION_STATE,
+    EVT_LIVENESS_CHECKED,
+    EVT_TOKEN_UPDATED,
+    EVT_UNKNOWN_ATTRS,
+    LIVENESS_CHECK_INTERVAL,
+    LIVENESS_DEFAULT_TIMEOUT,
+    LIVENESS_MIN_TIMEOUT,
+    POLL_JITTER,
+    POLL_MIN_INTERVAL,
+    RECONCILE_INTERVAL,
+    RECONNECT_BASE_DELAY,
+    RECONNECT_MAX_DELAY,
+    TRACE_SAMPLE_INTERVAL,
+)
 
 # from .const import CONF_HOST, CONF_HOST_API, MOCK_PASSWORD, MOCK_USERNAME
 
@@ -150,6 +186,654 @@ async def test_client_close_with_sleep(
 
     assert client._sleep_task.cancelled
 
+
+@pytest.mark.asyncio
+async def test_client_notifies_only_listeners_of_changed_keys(device_api_client):
+    """Frames should only reach the entities that consume one of their keys."""
+
+    flow_calls = []
+    temperature_calls = []
+    room_calls = []
+
+    device_api_client.async_subscribe_attrs(
+        ("Flow_temperature",), flow_calls.append
+    )
+    unsub = device_api_client.async_subscribe_attrs(
+        ("Flow_temperature", "return_temperature"), temperature_calls.append
+    )
+    device_api_client.async_subscribe_attrs(("Room_Temperature",), room_calls.append)
+
+    frame = {"Flow_temperature": 40, "return_temperature": 30}
+    device_api_client._async_notify_listeners(frame)
+
+    assert flow_calls == [frame]
+    assert temperature_calls == [frame]
+    assert room_calls == []
+
+    unsub()
+    device_api_client._async_notify_listeners({"return_temperature": 31})
+
+    assert temperature_calls == [frame]
+    assert "return_temperature" not in device_api_client._attr_listeners
+
+
+@pytest.mark.asyncio
+async def test_client_coalesces_frames_per_tick(hass, device_api_client):
+    """A burst of frames should reach each listener as one merged delta."""
+
+    calls = []
+    device_api_client.async_subscribe_attrs(
+        ("Flow_temperature", "return_temperature"), calls.append
+    )
+
+    device_api_client._async_queue_update({"Flow_temperature": 40})
+    device_api_client._async_queue_update({"Flow_temperature": 41})
+    device_api_client._async_queue_update({"return_temperature": 30})
+    assert calls == []
+
+    await hass.async_block_till_done()
+
+    assert calls == [{"Flow_temperature": 41, "return_temperature": 30}]
+    assert device_api_client.dropped_values == 1
+
+
+@pytest.mark.asyncio
+async def test_client_merges_commands_sent_in_a_burst(hass, device_api_client):
+    """Back-to-back commands should result in one cloud request."""
+
+    results = await asyncio.gather(
+        device_api_client.control_device({"DHW_setpoint": 45}),
+        device_api_client.control_device({"WarmStar_Tank_Loading_Enable": 1}),
+        device_api_client.control_device({"DHW_setpoint": 50}),
+    )
+
+    assert results == [True, True, True]
+    device_api_client._api_client.control_device.assert_awaited_once_with(
+        "1", {"DHW_setpoint": 50, "WarmStar_Tank_Loading_Enable": 1}
+    )
+
+
+@pytest.mark.asyncio
+async def test_client_token_refresh_is_shared_per_account(hass):
+    """Concurrent expirations of one account should log in only once."""
+
+    token_new = Token("a1", "u1", "p1", "new_token", "uid")
+    token_updates = []
+    async_dispatcher_connect(
+        hass, EVT_TOKEN_UPDATED.format("u1"), token_updates.append
+    )
+
+    with patch(
+        "vaillant_plus_cn_api.VaillantApiClient.login",
+        new=AsyncMock(return_value=token_new),
+    ) as login:
+        client_1 = VaillantClient(hass=hass, token=Token("a1", "u1", "p1"), device_id="1")
+        client_2 = VaillantClient(hass=hass, token=Token("a1", "u1", "p1"), device_id="2")
+
+        await asyncio.gather(
+            client_1._get_token(), client_2._get_token(), client_1._get_token()
+        )
+        await hass.async_block_till_done()
+
+    assert login.await_count == 1
+    assert token_updates == [token_new]
+    assert client_1._account is client_2._account
+    assert client_1.token is token_new
+    assert client_2.token is token_new
+
+
+@pytest.mark.asyncio
+async def test_client_learns_token_lifetime_and_renews_ahead(hass):
+    """Tokens should be renewed in the background before they expire."""
+
+    token_new = Token("a1", "u1", "p1", "new_token", "uid")
+
+    with patch(
+        "vaillant_plus_cn_api.VaillantApiClient.login",
+        new=AsyncMock(return_value=token_new),
+    ) as login:
+        client = VaillantClient(hass=hass, token=Token("a1", "u1", "p1"), device_id="1")
+        account = client._account
+        account.update_token(Token("a1", "u1", "p1", "old_token", "uid"))
+
+        with patch(
+            "custom_components.vaillant_plus.account.monotonic",
+            return_value=monotonic() + 3600,
+        ):
+            await client._get_token()
+        assert 3590 < account._token_lifetime < 3610
+        assert login.await_count == 1
+
+        account.update_token(token_new)
+        account.async_client_started()
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=3600))
+        await hass.async_block_till_done()
+
+        assert login.await_count == 2
+        assert account._cancel_token_renewal is not None
+
+        account.async_client_stopped()
+        assert account._cancel_token_renewal is None
+
+
+@pytest.mark.asyncio
+async def test_clients_of_one_account_share_device_list(hass, bypass_get_device):
+    """Devices on one account should share a single device list request."""
+
+    client_1 = VaillantClient(hass=hass, token=Token("a1", "u1", "p1"), device_id="1")
+    client_2 = VaillantClient(hass=hass, token=Token("a1", "u1", "p1"), device_id="1")
+    assert client_1._account is client_2._account
+
+    with patch(
+        "vaillant_plus_cn_api.VaillantApiClient.get_device_list",
+        new=AsyncMock(return_value=await client_1._account.api_client.get_device_list()),
+    ) as get_device_list:
+        devices = await asyncio.gather(
+            client_1._find_device(), client_2._find_device()
+        )
+
+    assert get_device_list.await_count == 1
+    assert [device.id for device in devices] == ["1", "1"]
+
+    await client_1.close()
+    assert client_1._account is client_2._account
+    await client_2.close()
+    assert "u1" not in hass.data[DOMAIN][ACCOUNTS]
+
+
+@pytest.mark.asyncio
+async def test_client_reconnects_without_fetching_device_list(hass, bypass_get_device):
+    """Reconnects should reuse the resolved device until a session looks stale."""
+
+    sessions = []
+
+    async def connect(websocket_client):
+        if len(sessions) in (0, 1, 4):
+            websocket_client._on_subscribe_handler({"RF_Status": 3})
+        elif len(sessions) == 2:
+            # Closed by the server before subscribing.
+            websocket_client._state = STATE_CONNECTED
+        else:
+            # Network failure, the library gives up at once with max_retry_attemps=0.
+            websocket_client._state = STATE_STOPPED
+        sessions.append(websocket_client)
+
+    client = VaillantClient(hass=hass, token=Token("a1", "u1", "p1"), device_id="1")
+    get_device_list = client._account.api_client.get_device_list
+
+    with patch.object(
+        VaillantWebsocketClient, "connect", autospec=True, side_effect=connect
+    ):
+        await client._connect()
+        await client._connect()
+        assert get_device_list.await_count == 1
+
+        await client._connect()
+        await client._connect()
+        assert get_device_list.await_count == 2
+
+        await client._connect()
+        assert get_device_list.await_count == 2
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_client_reconnects_right_after_a_session_ends(hass, bypass_get_device):
+    """A dropped session reconnects at once, failed attempts back off."""
+
+    client = VaillantClient(hass=hass, token=Token("a1", "u1", "p1"), device_id="1")
+    states = []
+    async_dispatcher_connect(
+        hass, EVT_CONNECTION_STATE.format("1"), states.append
+    )
+
+    sessions = []
+
+    async def connect(websocket_client):
+        sessions.append(websocket_client)
+        if len(sessions) == 1:
+            websocket_client._on_subscribe_handler({"RF_Status": 3})
+        elif len(sessions) == 3:
+            await client.close()
+
+    with patch.object(
+        VaillantWebsocketClient, "connect", autospec=True, side_effect=connect
+    ), patch(
+        "custom_components.vaillant_plus.client.RECONNECT_SPREAD", 0
+    ), patch(
+        "custom_components.vaillant_plus.client.RECONNECT_BASE_DELAY", 0
+    ), patch(
+        "custom_components.vaillant_plus.client.HEALTHY_SESSION_DURATION", 0
+    ):
+        await client.start()
+
+    assert len(sessions) == 3
+    assert states == [
+        CONNECTION_CONNECTING,
+        CONNECTION_SUBSCRIBED,
+        CONNECTION_DEGRADED,
+        CONNECTION_BACKOFF,
+        CONNECTION_CONNECTING,
+        CONNECTION_CLOSED,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_client_backs_off_after_repeated_short_sessions(hass, bypass_get_device):
+    """Sessions dropped right after subscribing must not reconnect in a tight loop."""
+
+    client = VaillantClient(hass=hass, token=Token("a1", "u1", "p1"), device_id="1")
+    states = []
+    async_dispatcher_connect(
+        hass, EVT_CONNECTION_STATE.format("1"), states.append
+    )
+    delays = []
+
+    async def connect(websocket_client):
+        delays.append(client._reconnect_delay)
+        if len(delays) == 4:
+            await client.close()
+            return
+        websocket_client._on_subscribe_handler({"RF_Status": 3})
+
+    with patch.object(
+        VaillantWebsocketClient, "connect", autospec=True, side_effect=connect
+    ), patch(
+        "custom_components.vaillant_plus.client.RECONNECT_BASE_DELAY", 0.001
+    ), patch(
+        "custom_components.vaillant_plus.client.RECONNECT_MAX_DELAY", 0.01
+    ):
+        await client.start()
+
+    assert delays[0] == 0
+    assert all(delay > 0 for delay in delays[1:])
+    assert CONNECTION_DEGRADED not in states
+    assert states.count(CONNECTION_BACKOFF) == 3
+
+@pytest.mark.asyncio
+async def test_client_reconnect_delay_is_jittered_and_capped(hass):
+    """Failed attempts should spread out and never wait longer than the cap."""
+
+    client = VaillantClient(hass=hass, token=Token("a1", "u1", "p1"), device_id="1")
+
+    delays = [client._next_reconnect_delay() for _ in range(50)]
+
+    assert all(RECONNECT_BASE_DELAY <= delay <= RECONNECT_MAX_DELAY for delay in delays)
+    assert len(set(delays)) > 1
+    assert max(delays) > RECONNECT_BASE_DELAY * 3
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_client_watchdog_learns_gaps_and_drops_unanswering_sessions(hass):
+    """A quiet session is probed with a ping and only dropped if nothing answers."""
+
+    client = VaillantClient(hass=hass, token=Token("a1", "u1", "p1"), device_id="1")
+    websocket_client = MagicMock(probe=AsyncMock(), close=AsyncMock())
+    client._websocket_client = websocket_client
+    client._state = CONNECTION_SUBSCRIBED
+
+    assert client.liveness_timeout == LIVENESS_DEFAULT_TIMEOUT
+
+    with patch("custom_components.vaillant_plus.client.monotonic") as now:
+        # The first frame arrives twice, then a two minute gap and a burst.
+        for timestamp, first in ((0, True), (0, False), (120, False), (121, False)):
+            now.return_value = timestamp
+            client._async_record_frame(first=first)
+        for timestamp in range(122, 152):
+            now.return_value = timestamp
+            client._async_record_frame()
+        # The burst does not shrink the largest gap seen.
+        assert client.liveness_timeout == pytest.approx(LIVENESS_MIN_TIMEOUT * 2, rel=0.01)
+
+        now.return_value = 300
+        assert client.last_frame_age == 149
+        await client._async_check_liveness(dt_util.utcnow())
+        websocket_client.probe.assert_not_awaited()
+
+        # Answered by a keepalive heartbeat, the quiet session is kept.
+        now.return_value = 400
+        await client._async_check_liveness(dt_util.utcnow())
+        websocket_client.probe.assert_awaited_once()
+        now.return_value = 415
+        client._async_record_heartbeat()
+        now.return_value = 430
+        await client._async_check_liveness(dt_util.utcnow())
+        websocket_client.close.assert_not_awaited()
+        assert client._probe_sent_at is None
+
+        # Heard from nothing after the next probe, the session is dropped.
+        now.return_value = 660
+        await client._async_check_liveness(dt_util.utcnow())
+        assert websocket_client.probe.await_count == 2
+        now.return_value = 690
+        await client._async_check_liveness(dt_util.utcnow())
+        websocket_client.close.assert_awaited_once()
+
+    client._websocket_client = None
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_client_liveness_checks_continue_while_disconnected(hass):
+    """The frame age keeps being announced after the session is gone."""
+
+    client = VaillantClient(hass=hass, token=Token("a1", "u1", "p1"), device_id="1")
+    websocket_client = MagicMock(probe=AsyncMock(), close=AsyncMock())
+    client._websocket_client = websocket_client
+    checks = []
+    async_dispatcher_connect(
+        hass, EVT_LIVENESS_CHECKED.format("1"), lambda: checks.append(client.connection_state)
+    )
+
+    client._async_set_connection_state(CONNECTION_SUBSCRIBED)
+    client._async_record_frame(first=True)
+    client._async_set_connection_state(CONNECTION_DEGRADED)
+    with patch.object(client, "_async_start_polling"):
+        client._async_set_connection_state(CONNECTION_BACKOFF)
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=LIVENESS_CHECK_INTERVAL)
+    )
+    await hass.async_block_till_done()
+
+    assert checks == [CONNECTION_BACKOFF]
+    websocket_client.probe.assert_not_awaited()
+
+    client._websocket_client = None
+    await client.close()
+    assert client._cancel_watchdog is None
+
+@pytest.mark.asyncio
+async def test_client_polls_snapshots_while_push_is_down(hass, bypass_get_device):
+    """Polling merges changed values, slows down when stable and stops on push."""
+
+    client = VaillantClient(hass=hass, token=Token("a1", "u1", "p1"), device_id="1")
+    await client._async_resolve_device()
+    client._device_attrs = DeviceSnapshot({"Flow_temperature": 40, "RF_Status": 3})
+    updates = []
+    client.async_subscribe_attrs(("Flow_temperature", "RF_Status"), updates.append)
+
+    fetch_snapshot = AsyncMock(
+        side_effect=[
+            {"Flow_temperature": 41, "RF_Status": 3},
+            {"Flow_temperature": 41, "RF_Status": 3},
+        ]
+    )
+    with patch.object(client, "_async_fetch_snapshot", fetch_snapshot):
+        client._async_set_connection_state(CONNECTION_BACKOFF)
+        assert client.is_polling
+        assert not client.is_connected
+
+        async_fire_time_changed(
+            hass,
+            dt_util.utcnow() + timedelta(seconds=POLL_MIN_INTERVAL * (1 + POLL_JITTER)),
+        )
+        await hass.async_block_till_done()
+        assert updates == [{"Flow_temperature": 41}]
+        assert client.is_connected
+        assert client._poll_interval == POLL_MIN_INTERVAL
+
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=POLL_MIN_INTERVAL * 5)
+        )
+        await hass.async_block_till_done()
+        assert len(updates) == 1
+        assert client._poll_interval == POLL_MIN_INTERVAL * 2
+
+        client._async_set_connection_state(CONNECTION_SUBSCRIBED)
+        assert not client.is_polling
+        assert fetch_snapshot.await_count == 2
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_client_polls_no_faster_than_backoff_and_wakes_reconnect(
+    hass, bypass_get_device
+):
+    """Polls wait for the backoff delay, a successful one reconnects right away."""
+
+    client = VaillantClient(hass=hass, token=Token("a1", "u1", "p1"), device_id="1")
+    await client._async_resolve_device()
+    client._reconnect_delay = POLL_MIN_INTERVAL * 4
+    sleep = asyncio.create_task(client._async_sleep(RECONNECT_MAX_DELAY))
+    await asyncio.sleep(0)
+
+    fetch_snapshot = AsyncMock(return_value={"Flow_temperature": 41})
+    with patch.object(client, "_async_fetch_snapshot", fetch_snapshot):
+        client._async_set_connection_state(CONNECTION_BACKOFF)
+        async_fire_time_changed(
+            hass,
+            dt_util.utcnow() + timedelta(seconds=POLL_MIN_INTERVAL * (1 + POLL_JITTER)),
+        )
+        await hass.async_block_till_done()
+        fetch_snapshot.assert_not_awaited()
+        assert not sleep.done()
+
+        async_fire_time_changed(
+            hass,
+            dt_util.utcnow()
+            + timedelta(seconds=client._reconnect_delay * (1 + POLL_JITTER)),
+        )
+        await hass.async_block_till_done()
+        fetch_snapshot.assert_awaited_once()
+        await sleep
+        assert client._wake_requested is False
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_client_reconciles_drifted_attributes(hass, bypass_get_device):
+    """Only values that drifted are corrected, newer frames are kept."""
+
+    client = VaillantClient(hass=hass, token=Token("a1", "u1", "p1"), device_id="1")
+    await client._async_resolve_device()
+    client._device_attrs = DeviceSnapshot(
+        {"Flow_temperature": 40, "RF_Status": 3, "Fault_code": 0}
+    )
+    updates = []
+    client.async_subscribe_attrs(client.device_attrs, updates.append)
+
+    async def fetch_snapshot():
+        # A frame arriving while the snapshot is fetched is newer than the snapshot.
+        client._async_merge_attrs({"RF_Status": 4})
+        return {"Flow_temperature": 45, "RF_Status": 3}
+
+    with patch.object(client, "_async_fetch_snapshot", side_effect=fetch_snapshot):
+        client._async_set_connection_state(CONNECTION_SUBSCRIBED)
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=RECONCILE_INTERVAL)
+        )
+        await hass.async_block_till_done()
+
+    assert client.device_attrs == {"Flow_temperature": 45, "RF_Status": 4}
+    assert updates == [{"RF_Status": 4, "Flow_temperature": 45, "Fault_code": None}]
+    assert client.drift_count == 1
+    assert client.drifted_keys == 2
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_client_replays_only_changes_after_reconnect(hass, bypass_get_device):
+    """A reconnect should only deliver values that changed while disconnected."""
+
+    snapshots = [
+        {"Flow_temperature": 40, "RF_Status": 3, "Fault_code": 0},
+        {"Flow_temperature": 45, "RF_Status": 3},
+    ]
+
+    async def connect(websocket_client):
+        snapshot = snapshots.pop(0)
+        websocket_client._on_subscribe_handler(snapshot)
+        websocket_client._on_update_handler(EVT_DEVICE_ATTR_UPDATE, {"data": snapshot})
+
+    client = VaillantClient(hass=hass, token=Token("a1", "u1", "p1"), device_id="1")
+    updates = []
+    client.async_subscribe_attrs(snapshots[0], updates.append)
+
+    with patch.object(
+        VaillantWebsocketClient, "connect", autospec=True, side_effect=connect
+    ):
+        await client._connect()
+        await hass.async_block_till_done()
+        await client._connect()
+        await hass.async_block_till_done()
+
+    assert updates == [
+        {"Flow_temperature": 40, "RF_Status": 3, "Fault_code": 0},
+        {"Flow_temperature": 45, "Fault_code": None},
+    ]
+    assert client.device_attrs == {"Flow_temperature": 45, "RF_Status": 3}
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_client_drops_frames_of_superseded_sessions(hass, bypass_get_device):
+    """A late frame of a closed session must not overwrite newer values."""
+
+    sessions = []
+
+    async def connect(websocket_client):
+        sessions.append(websocket_client)
+        websocket_client._on_subscribe_handler({"Flow_temperature": 40})
+
+    client = VaillantClient(hass=hass, token=Token("a1", "u1", "p1"), device_id="1")
+
+    with patch.object(
+        VaillantWebsocketClient, "connect", autospec=True, side_effect=connect
+    ):
+        await client._connect()
+        await client._connect()
+
+    sessions[1]._on_update_handler(
+        EVT_DEVICE_ATTR_UPDATE, {"data": {"Flow_temperature": 45}}
+    )
+    updated_at = client.attr_last_updated("Flow_temperature")
+    sessions[0]._on_update_handler(
+        EVT_DEVICE_ATTR_UPDATE, {"data": {"Flow_temperature": 41}}
+    )
+    await hass.async_block_till_done()
+
+    assert client.device_attrs == {"Flow_temperature": 45}
+    assert client.rejected_frames == 1
+    assert updated_at is not None
+    assert client.attr_last_updated("Flow_temperature") == updated_at
+    assert client.attr_last_updated("RF_Status") is None
+
+    # Keepalive pings of the library count as heartbeats of their own session only.
+    with patch.object(VaillantWebsocketClient, "ping", autospec=True) as ping:
+        await sessions[0].ping()
+        assert client._last_heartbeat_at is None
+        await sessions[1].ping()
+        assert client._last_heartbeat_at is not None
+        await sessions[1].probe()
+        assert ping.await_count == 3
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_client_discovery_runs_once_when_keys_appear(hass):
+    """Platform discovery checks its predicate once, then stops listening."""
+    client = VaillantClient(hass=hass, token=Token("a1", "u1", "p1"), device_id="1")
+    checked = []
+    discovered = []
+
+    def has_setpoint(device_attrs):
+        checked.append(dict(device_attrs))
+        return device_attrs.get("DHW_setpoint") is not None
+
+    client.async_discover(
+        ("DHW_setpoint",), has_setpoint, lambda: discovered.append("water_heater")
+    )
+    cancel = client.async_discover(
+        ("Enabled_Heating",), lambda _: True, lambda: discovered.append("climate")
+    )
+
+    client._async_merge_attrs({"Flow_temperature": 40})
+    await hass.async_block_till_done()
+    assert checked == []
+
+    client._async_merge_attrs({"DHW_setpoint": 45})
+    await hass.async_block_till_done()
+    client._async_merge_attrs({"DHW_setpoint": 46})
+    await hass.async_block_till_done()
+    assert checked == [{"Flow_temperature": 40, "DHW_setpoint": 45}]
+    assert discovered == ["water_heater"]
+
+    cancel()
+    assert client._discoveries == {}
+
+    # Keys that are already known are checked right away.
+    client.async_discover(
+        ("Flow_temperature",), lambda _: True, lambda: discovered.append("sensor")
+    )
+    assert discovered == ["water_heater", "sensor"]
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_client_tracks_bounded_unknown_attributes(hass):
+    """Unknown attributes are counted and announced, but only up to the limit."""
+    attribute_keys = AttributeKeyTable()
+    attribute_keys.register(("Flow_temperature",))
+    client = VaillantClient(hass=hass, token=Token("a1", "u1", "p1"), device_id="1")
+    announced = []
+    async_dispatcher_connect(
+        hass, EVT_UNKNOWN_ATTRS.format("1"), announced.extend
+    )
+
+    with patch(
+        "custom_components.vaillant_plus.client.UNKNOWN_ATTRS_LIMIT", 2
+    ), patch("custom_components.vaillant_plus.client.ATTRIBUTE_KEYS", attribute_keys):
+        client._async_merge_attrs({"Flow_temperature": 40, "New_attr_1": 1})
+        client._async_merge_attrs({"New_attr_1": 2, "New_attr_2": 1})
+        client._async_merge_attrs({"New_attr_3": 1, "New_attr_1": 3})
+        # Full snapshots never report the attributes that do not fit as changed.
+        snapshot = {"Flow_temperature": 40, "New_attr_1": 3, "New_attr_2": 1}
+        assert client._async_apply_snapshot({**snapshot, "New_attr_3": 1}) == {}
+    await hass.async_block_till_done()
+
+    assert announced == ["New_attr_1", "New_attr_2"]
+    assert client.unknown_attrs == {"New_attr_1": 3, "New_attr_2": 1}
+    assert client.dropped_unknown_attrs == 2
+    assert "New_attr_3" not in client.device_attrs
+    assert client.device_attrs["New_attr_1"] == 3
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_client_traces_sampled_payloads_when_opted_in(hass, caplog):
+    """Payloads are only traced by the trace logger, and only a sample of them."""
+    client = VaillantClient(hass=hass, token=Token("a1", "u1", "p1"), device_id="1")
+    assert client.signal(EVT_CONNECTION_STATE) == EVT_CONNECTION_STATE.format("1")
+    trace_logger = logging.getLogger("custom_components.vaillant_plus.client.trace")
+
+    caplog.set_level(logging.DEBUG, logger="custom_components.vaillant_plus")
+    client._async_merge_attrs({"Flow_temperature": 40})
+    await hass.async_block_till_done()
+    assert "delta #" not in caplog.text
+
+    trace_logger.setLevel(logging.DEBUG)
+    try:
+        for value in range(TRACE_SAMPLE_INTERVAL):
+            client._async_merge_attrs({"Flow_temperature": value})
+            await hass.async_block_till_done()
+    finally:
+        trace_logger.setLevel(logging.NOTSET)
+
+    assert caplog.text.count("delta #") == 1
+
+    await client.close()
+
 # # In order to get 100% coverage, we need to test `api_wrapper` to test the code
 # # that isn't already called by `async_get_data` and `async_set_title`. Because the
 # # only logic that lives inside `api_wrapper` that is not being handled by a third
@@ -205,3 +889,4 @@ async def test_client_close_with_sleep(
 # #     len(caplog.record_tuples) == 1
 # #     and "Error parsing information from" in caplog.record_tuples[0][2]
 # # )
+
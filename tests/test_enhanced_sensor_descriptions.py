@@ -22,7 +22,7 @@ def _sensor_description_keys() -> set[str]:
             continue
         if not isinstance(node.func, ast.Name):
             continue
-        if node.func.id != "SensorEntityDescription":
+        if node.func.id not in ("SensorEntityDescription", "VaillantSensorDescription"):
             continue
         for keyword in node.keywords:
             if keyword.arg == "key" and isinstance(keyword.value, ast.Constant):
@@ -1,4 +1,5 @@
 """Test vaillant-plus switch."""
+import asyncio
 from unittest.mock import patch
 
 from homeassistant.components.climate.const import HVACAction
@@ -6,18 +7,30 @@ from homeassistant.config_entries import ConfigEntryState
 from homeassistant.const import (
     ATTR_FRIENDLY_NAME,
     ATTR_TEMPERATURE,
+    EVENT_STATE_CHANGED,
     STATE_OFF,
     STATE_ON,
+    STATE_UNAVAILABLE,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 from vaillant_plus_cn_api import EVT_DEVICE_ATTR_UPDATE
 
 from custom_components.vaillant_plus import (
     VaillantClient,
+    async_remove_entry,
     async_setup,
 )
-from custom_components.vaillant_plus.const import DISPATCHERS, DOMAIN, API_CLIENT
+from custom_components.vaillant_plus.const import (
+    API_CLIENT,
+    ATTR_STALE,
+    CONNECTION_BACKOFF,
+    CONNECTION_CLOSED,
+    CONNECTION_DEGRADED,
+    DISPATCHERS,
+    DOMAIN,
+)
 
 from .const import (
     MOCK_CONFIG_ENTRY_DATA,
@@ -92,6 +105,15 @@ async def test_init_setup_and_unload_entry(hass: HomeAssistant, bypass_login, by
         assert state_climate.attributes.get("hvac_action") == STATE_OFF
         assert state_climate.attributes.get("current_temperature") == 18.5
 
+        # The device sends two character status words, so only bit 1 is offered.
+        registry = er.async_get(hass)
+        assert registry.async_get_entity_id(
+            "binary_sensor", DOMAIN, f"{MOCK_DID}_Boiler_info3_word_bit1"
+        )
+        assert not registry.async_get_entity_id(
+            "binary_sensor", DOMAIN, f"{MOCK_DID}_Boiler_info3_word_bit2"
+        )
+
         # Test whether entities handle correctly when connect event triggered again
         client._on_subscribe_handler(MOCK_DEVICE_ATTRS_WHEN_CONNECT)
 
@@ -99,6 +121,7 @@ async def test_init_setup_and_unload_entry(hass: HomeAssistant, bypass_login, by
         client._on_update_handler(
             EVT_DEVICE_ATTR_UPDATE, {"data": MOCK_DEVICE_ATTRS_WHEN_UPDATE}
         )
+        await hass.async_block_till_done()
         state_water_heater = hass.states.get(
             "water_heater.vaillant_plus_1_water_heater"
         )
@@ -122,3 +145,261 @@ async def test_init_setup_and_unload_entry(hass: HomeAssistant, bypass_login, by
             assert config_entry.state == ConfigEntryState.NOT_LOADED
             assert close_func.called
             assert config_entry.entry_id not in hass.data[DOMAIN][API_CLIENT]
+
+
+async def test_unchanged_frames_do_not_write_state(
+    hass: HomeAssistant, bypass_login, bypass_get_device
+):
+    """Frames repeating the current values should not trigger state writes."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN, data=MOCK_CONFIG_ENTRY_DATA, entry_id=MOCK_DID
+    )
+    config_entry.add_to_hass(hass)
+
+    with patch("vaillant_plus_cn_api.VaillantWebsocketClient.connect"):
+        assert await async_setup(hass, {})
+        await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        client: VaillantClient = hass.data[DOMAIN][API_CLIENT][config_entry.entry_id]
+        client._websocket_client._on_subscribe_handler(MOCK_DEVICE_ATTRS_WHEN_CONNECT)
+        await hass.async_block_till_done()
+
+        state_climate = hass.states.get("climate.vaillant_plus_1_climate")
+        suppressed_writes = client.suppressed_writes
+
+        client._websocket_client._on_update_handler(
+            EVT_DEVICE_ATTR_UPDATE,
+            {"data": {"Room_Temperature": 18.5, "Heating_Enable": 0}},
+        )
+        await hass.async_block_till_done()
+
+        assert client.suppressed_writes > suppressed_writes
+        assert (
+            hass.states.get("climate.vaillant_plus_1_climate").last_updated
+            == state_climate.last_updated
+        )
+
+        await hass.config_entries.async_unload(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+
+async def test_reconnect_without_changes_does_not_write_state(
+    hass: HomeAssistant, bypass_login, bypass_get_device
+):
+    """Entities stay available through a quick reconnect and are not rewritten."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN, data=MOCK_CONFIG_ENTRY_DATA, entry_id=MOCK_DID
+    )
+    config_entry.add_to_hass(hass)
+
+    with patch(
+        "vaillant_plus_cn_api.VaillantWebsocketClient.connect",
+        side_effect=asyncio.Event().wait,
+    ):
+        assert await async_setup(hass, {})
+        await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        client: VaillantClient = hass.data[DOMAIN][API_CLIENT][config_entry.entry_id]
+        client._websocket_client._on_subscribe_handler(MOCK_DEVICE_ATTRS_WHEN_CONNECT)
+        await hass.async_block_till_done()
+
+        writes = []
+        hass.bus.async_listen(EVENT_STATE_CHANGED, writes.append)
+
+        client._async_set_connection_state(CONNECTION_DEGRADED)
+        await hass.async_block_till_done()
+        assert hass.states.get("climate.vaillant_plus_1_climate").state != STATE_UNAVAILABLE
+
+        client._websocket_client._on_subscribe_handler(MOCK_DEVICE_ATTRS_WHEN_CONNECT)
+        await hass.async_block_till_done()
+
+        assert writes == []
+
+        await hass.config_entries.async_unload(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+async def test_restores_last_known_snapshot(
+    hass: HomeAssistant, hass_storage, bypass_login, bypass_get_device
+):
+    """Entities come back from the saved snapshot before the device connects."""
+    hass_storage[f"{DOMAIN}.{MOCK_DID}"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{MOCK_DID}",
+        "data": {
+            "device": {
+                "id": MOCK_DID,
+                "mac": "mac2",
+                "product_key": "pk",
+                "product_id": "p1",
+                "product_name": "pn",
+                "product_verbose_name": "pvn",
+                "is_online": True,
+                "is_manager": True,
+                "group_id": 2,
+                "sno": "sno",
+                "create_time": "2000-01-01 00:00:00",
+                "model_alias": "weijingling",
+                "model": "model_name",
+                "serial_number": "s1",
+            },
+            "attrs": MOCK_DEVICE_ATTRS_WHEN_CONNECT,
+            "entity_keys": {"climate": ["climate"], "sensor": ["Flow_temperature"]},
+        },
+    }
+    config_entry = MockConfigEntry(
+        domain=DOMAIN, data=MOCK_CONFIG_ENTRY_DATA, entry_id=MOCK_DID
+    )
+    config_entry.add_to_hass(hass)
+
+    # Keep the first session connecting until the test subscribes it.
+    with patch(
+        "vaillant_plus_cn_api.VaillantWebsocketClient.connect",
+        side_effect=asyncio.Event().wait,
+    ):
+        assert await async_setup(hass, {})
+        await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        state_climate = hass.states.get("climate.vaillant_plus_1_climate")
+        assert state_climate.attributes.get("current_temperature") == 18.5
+        assert state_climate.attributes.get(ATTR_STALE) is True
+        assert hass.states.get("sensor.flow_temperature").state == "33.5"
+        assert hass.states.get("water_heater.vaillant_plus_1_water_heater") is None
+
+        client: VaillantClient = hass.data[DOMAIN][API_CLIENT][config_entry.entry_id]
+        client._websocket_client._on_subscribe_handler(MOCK_DEVICE_ATTRS_WHEN_UPDATE)
+        await hass.async_block_till_done()
+
+        state_climate = hass.states.get("climate.vaillant_plus_1_climate")
+        assert state_climate.attributes.get("current_temperature") == 20.5
+        assert ATTR_STALE not in state_climate.attributes
+        assert hass.states.get("water_heater.vaillant_plus_1_water_heater") is not None
+
+        # Losing the session shows up at once, without waiting for a frame.
+        client._async_set_connection_state(CONNECTION_BACKOFF)
+        await hass.async_block_till_done()
+        assert hass.states.get("climate.vaillant_plus_1_climate").state == STATE_UNAVAILABLE
+        assert hass.states.get("sensor.flow_temperature").state == STATE_UNAVAILABLE
+
+        await hass.config_entries.async_unload(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+
+
+async def test_restores_status_word_bits(
+    hass: HomeAssistant, hass_storage, bypass_login, bypass_get_device
+):
+    """Bits of restored status words are parsed before the platforms are set up."""
+    hass_storage[f"{DOMAIN}.{MOCK_DID}"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{MOCK_DID}",
+        "data": {
+            "device": {
+                "id": MOCK_DID,
+                "mac": "mac2",
+                "product_key": "pk",
+                "product_id": "p1",
+                "product_name": "pn",
+                "product_verbose_name": "pvn",
+                "is_online": True,
+                "is_manager": True,
+                "group_id": 2,
+                "sno": "sno",
+                "create_time": "2000-01-01 00:00:00",
+                "model_alias": "weijingling",
+                "model": "model_name",
+                "serial_number": "s1",
+            },
+            "attrs": {**MOCK_DEVICE_ATTRS_WHEN_CONNECT, "Boiler_info3_bit0": "10"},
+            "entity_keys": {"binary_sensor": ["Boiler_info3_bit0"]},
+        },
+    }
+    config_entry = MockConfigEntry(
+        domain=DOMAIN, data=MOCK_CONFIG_ENTRY_DATA, entry_id=MOCK_DID
+    )
+    config_entry.add_to_hass(hass)
+
+    with patch(
+        "vaillant_plus_cn_api.VaillantWebsocketClient.connect",
+        side_effect=asyncio.Event().wait,
+    ):
+        assert await async_setup(hass, {})
+        await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        client: VaillantClient = hass.data[DOMAIN][API_CLIENT][config_entry.entry_id]
+        assert client.bit_field("Boiler_info3_bit0") == 0b01
+        assert hass.states.get("binary_sensor.boiler_heating_demand").state == STATE_ON
+
+        # The live session sends the same word, so only the restored parse has it.
+        client._websocket_client._on_subscribe_handler(
+            {**MOCK_DEVICE_ATTRS_WHEN_UPDATE, "Boiler_info3_bit0": "10"}
+        )
+        await hass.async_block_till_done()
+        assert hass.states.get("binary_sensor.boiler_heating_demand").state == STATE_ON
+
+        await hass.config_entries.async_unload(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+
+async def test_restored_entities_go_unavailable_when_device_is_gone(
+    hass: HomeAssistant, hass_storage, bypass_login, bypass_get_no_device
+):
+    """Restored values are not shown forever once the client gives up."""
+    hass_storage[f"{DOMAIN}.{MOCK_DID}"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{MOCK_DID}",
+        "data": {
+            "device": {
+                "id": MOCK_DID,
+                "mac": "mac2",
+                "product_key": "pk",
+                "product_id": "p1",
+                "product_name": "pn",
+                "product_verbose_name": "pvn",
+                "is_online": True,
+                "is_manager": True,
+                "group_id": 2,
+                "sno": "sno",
+                "create_time": "2000-01-01 00:00:00",
+                "model_alias": "weijingling",
+                "model": "model_name",
+                "serial_number": "s1",
+            },
+            "attrs": MOCK_DEVICE_ATTRS_WHEN_CONNECT,
+            "entity_keys": {"climate": ["climate"]},
+        },
+    }
+    config_entry = MockConfigEntry(
+        domain=DOMAIN, data=MOCK_CONFIG_ENTRY_DATA, entry_id=MOCK_DID
+    )
+    config_entry.add_to_hass(hass)
+
+    assert await async_setup(hass, {})
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    client: VaillantClient = hass.data[DOMAIN][API_CLIENT][config_entry.entry_id]
+    assert client.connection_state == CONNECTION_CLOSED
+    assert client.is_stale is False
+    assert hass.states.get("climate.vaillant_plus_1_climate").state == STATE_UNAVAILABLE
+
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+async def test_remove_entry_deletes_saved_snapshot(hass: HomeAssistant, hass_storage):
+    """Deleting a config entry does not leave its device snapshot behind."""
+    hass_storage[f"{DOMAIN}.{MOCK_DID}"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{MOCK_DID}",
+        "data": {"attrs": {}},
+    }
+    config_entry = MockConfigEntry(
+        domain=DOMAIN, data=MOCK_CONFIG_ENTRY_DATA, entry_id=MOCK_DID
+    )
+
+    await async_remove_entry(hass, config_entry)
+
+    assert f"{DOMAIN}.{MOCK_DID}" not in hass_storage
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from custom_components.vaillant_plus.state import parse_bit_field
+
 ROOT = Path(__file__).resolve().parents[1]
 
 
@@ -18,14 +20,13 @@ def test_binary_sensor_entities_ignore_partial_updates_without_their_key():
     """Binary sensor update handlers should keep state on unrelated updates."""
     source = (ROOT / "custom_components/vaillant_plus/binary_sensor.py").read_text()
 
-    assert "if self.entity_description.key not in data:" in source
+    assert "if self.entity_description.attr not in data:" in source
 
 
 def test_binary_sensor_bit_fields_accept_integer_values():
     """Vaillant+ may send boiler bit fields as either strings or integers."""
-    source = (ROOT / "custom_components/vaillant_plus/binary_sensor.py").read_text()
-
-    assert 'str(value).startswith("1")' in source
+    assert parse_bit_field(10) == parse_bit_field("10") == 0b01
+    assert parse_bit_field(1) == parse_bit_field("1") == 0b1
 
 
 def test_climate_accepts_current_heating_enable_attribute():
@@ -40,16 +41,15 @@ def test_client_merges_partial_device_updates():
     """Websocket updates should not drop attributes omitted from a partial frame."""
     source = (ROOT / "custom_components/vaillant_plus/client.py").read_text()
 
-    assert "self._device_attrs.update(device_attrs)" in source
-    assert "self._device_attrs = device_attrs.copy()" in source
+    assert "self._device_attrs = self._device_attrs.merge(device_attrs, removed)" in source
+    assert "self._device_attrs = DeviceSnapshot(device_attrs)" in source
 
 
 def test_climate_can_be_created_from_later_update_events():
     """Climate creation should not depend only on the first connected frame."""
     source = (ROOT / "custom_components/vaillant_plus/climate.py").read_text()
 
-    assert "EVT_DEVICE_UPDATED" in source
-    assert "for signal in (EVT_DEVICE_CONNECTED, EVT_DEVICE_UPDATED):" in source
+    assert "client.async_discover(" in source
 
 
 def test_water_heater_accepts_current_dhw_enable_attributes():
@@ -0,0 +1,192 @@
+"""Test vaillant-plus sensor."""
+from unittest.mock import MagicMock, patch
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import EntityCategory
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from vaillant_plus_cn_api import EVT_DEVICE_ATTR_UPDATE, Token, VaillantWebsocketClient
+
+from custom_components.vaillant_plus import VaillantClient, async_setup
+from custom_components.vaillant_plus.const import API_CLIENT, DOMAIN
+from custom_components.vaillant_plus.entity import async_discover_descriptions
+from custom_components.vaillant_plus.sensor import (
+    SENSOR_DESCRIPTIONS,
+    VaillantLastFrameAgeSensor,
+    VaillantSensorDescription,
+    VaillantSensorEntity,
+    generic_sensor_description,
+)
+
+from .const import MOCK_CONFIG_ENTRY_DATA, MOCK_DEVICE_ATTRS_WHEN_CONNECT, MOCK_DID
+
+
+async def test_sensor_deadband_and_min_interval(device_api_client):
+    """Small or early changes are held back until the thresholds allow them."""
+    sensor = VaillantSensorEntity(
+        device_api_client,
+        VaillantSensorDescription(
+            key="Flow_temperature",
+            name="Flow temperature",
+            device_class=SensorDeviceClass.TEMPERATURE,
+            state_class=SensorStateClass.MEASUREMENT,
+            deadband=0.5,
+            min_interval=30,
+            max_age=600,
+        ),
+    )
+
+    with patch(
+        "custom_components.vaillant_plus.sensor.monotonic", return_value=1000
+    ):
+        sensor.update_from_latest_data({"Flow_temperature": 40})
+    assert sensor.native_value == 40
+
+    # Too early, even though the change is larger than the deadband.
+    with patch(
+        "custom_components.vaillant_plus.sensor.monotonic", return_value=1010
+    ):
+        sensor.update_from_latest_data({"Flow_temperature": 45})
+    assert sensor.native_value == 40
+
+    # Late enough, but inside the deadband.
+    with patch(
+        "custom_components.vaillant_plus.sensor.monotonic", return_value=1100
+    ):
+        sensor.update_from_latest_data({"Flow_temperature": 40.2})
+    assert sensor.native_value == 40
+
+    # Outside the deadband.
+    with patch(
+        "custom_components.vaillant_plus.sensor.monotonic", return_value=1110
+    ):
+        sensor.update_from_latest_data({"Flow_temperature": 41})
+    assert sensor.native_value == 41
+
+    # Inside the deadband, but the published value is too old.
+    with patch(
+        "custom_components.vaillant_plus.sensor.monotonic", return_value=1800
+    ):
+        sensor.update_from_latest_data({"Flow_temperature": 41.2})
+    assert sensor.native_value == 41.2
+
+
+async def test_sensor_without_throttling_publishes_every_value(device_api_client):
+    """Sensors without a deadband publish every change immediately."""
+    sensor = VaillantSensorEntity(
+        device_api_client,
+        VaillantSensorDescription(key="Fault_List_1", name="Fault list 1"),
+    )
+
+    sensor.update_from_latest_data({"Fault_List_1": 1})
+    sensor.update_from_latest_data({"Fault_List_1": 2})
+    assert sensor.native_value == 2
+
+    sensor.update_from_latest_data({"Room_Temperature": 20})
+    assert sensor.native_value == 2
+
+
+async def test_last_frame_age_sensor():
+    """The age sensor is pushed, stays available and reports whole seconds."""
+    client = MagicMock(last_frame_age=None, is_connected=False, is_stale=False)
+    sensor = VaillantLastFrameAgeSensor(client)
+
+    assert sensor.should_poll is False
+    assert sensor.available is True
+    assert sensor.native_value is None
+
+    client.last_frame_age = 12.6
+    assert sensor.native_value == 13
+
+
+async def test_generic_sensor_for_unknown_attribute(device_api_client):
+    """Attributes no description knows get a disabled diagnostic sensor."""
+    sensor = VaillantSensorEntity(
+        device_api_client, generic_sensor_description("New_firmware_attr")
+    )
+
+    assert sensor.unique_id == "1_New_firmware_attr"
+    assert sensor.unique_id is sensor.unique_id
+    assert sensor.device_info is sensor.device_info
+    assert sensor.entity_registry_enabled_default is False
+    assert sensor.entity_category == EntityCategory.DIAGNOSTIC
+
+    sensor.update_from_latest_data({"New_firmware_attr": "abc"})
+    assert sensor.native_value == "abc"
+
+
+async def test_sensors_for_attributes_of_later_frames(
+    hass: HomeAssistant, bypass_login, bypass_get_device
+):
+    """Attributes first sent in partial updates still get their sensors."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN, data=MOCK_CONFIG_ENTRY_DATA, entry_id=MOCK_DID
+    )
+    config_entry.add_to_hass(hass)
+
+    with patch("vaillant_plus_cn_api.VaillantWebsocketClient.connect"):
+        assert await async_setup(hass, {})
+        await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        client: VaillantClient = hass.data[DOMAIN][API_CLIENT][config_entry.entry_id]
+        attrs = dict(MOCK_DEVICE_ATTRS_WHEN_CONNECT)
+        del attrs["DHW_setpoint"]
+        client._websocket_client._on_subscribe_handler(attrs)
+        await hass.async_block_till_done()
+
+        assert hass.states.get("sensor.flow_temperature").state == "33.5"
+        assert hass.states.get("sensor.domestic_hot_water_setpoint") is None
+
+        client._websocket_client._on_update_handler(
+            EVT_DEVICE_ATTR_UPDATE, {"data": {"DHW_setpoint": 46}}
+        )
+        await hass.async_block_till_done()
+
+        assert hass.states.get("sensor.domestic_hot_water_setpoint").state == "46"
+        assert "DHW_setpoint" not in client._discoveries
+
+        await hass.config_entries.async_unload(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+
+async def test_sensors_of_one_delta_are_added_at_once(
+    hass: HomeAssistant, bypass_get_device
+):
+    """Descriptions discovered by the same delta are added in one batch."""
+
+    async def connect(websocket_client):
+        attrs = dict(MOCK_DEVICE_ATTRS_WHEN_CONNECT)
+        del attrs["DHW_setpoint"]
+        websocket_client._on_subscribe_handler(attrs)
+
+    client = VaillantClient(hass=hass, token=Token("a1", "u1", "p1"), device_id="1")
+    batches = []
+    cancel = async_discover_descriptions(
+        client, Platform.SENSOR, SENSOR_DESCRIPTIONS, batches.append
+    )
+
+    with patch.object(
+        VaillantWebsocketClient, "connect", autospec=True, side_effect=connect
+    ):
+        await client._connect()
+        await hass.async_block_till_done()
+
+    assert len(batches) == 1
+    assert "Flow_temperature" in {description.key for description in batches[0]}
+    assert "DHW_setpoint" not in {description.key for description in batches[0]}
+
+    client._websocket_client._on_update_handler(
+        EVT_DEVICE_ATTR_UPDATE, {"data": {"DHW_setpoint": 46}}
+    )
+    await hass.async_block_till_done()
+
+    assert [description.key for description in batches[1]] == ["DHW_setpoint"]
+    assert client._discoveries.keys() == {
+        description.key for description in SENSOR_DESCRIPTIONS
+    } - set(MOCK_DEVICE_ATTRS_WHEN_CONNECT)
+
+    cancel()
+    assert not client._discoveries
+    await client.close()
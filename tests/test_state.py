@@ -0,0 +1,63 @@
+"""Test vaillant-plus device snapshots."""
+import copy
+
+import pytest
+
+from custom_components.vaillant_plus.state import AttributeKeyTable, DeviceSnapshot
+
+
+def test_snapshot_merge_creates_next_version():
+    """Merging never changes a snapshot that readers may still hold."""
+    first = DeviceSnapshot({"Flow_temperature": 40, "Fault_code": 0})
+
+    second = first.merge({"Flow_temperature": 45}, removed=("Fault_code",))
+
+    assert first == {"Flow_temperature": 40, "Fault_code": 0}
+    assert second == {"Flow_temperature": 45}
+    assert second.version == first.version + 1
+    assert second.get("Fault_code") is None
+    assert "Fault_code" not in second
+    with pytest.raises(TypeError):
+        second["Flow_temperature"] = 50  # type: ignore[index]
+    with pytest.raises(TypeError):
+        second.update(Flow_temperature=50)
+    assert copy.copy(second) == second
+    assert copy.copy(second).version == second.version
+
+
+def test_snapshot_reads_are_dict_reads():
+    """Reads go straight to the dict methods, no Python frame per lookup."""
+    assert DeviceSnapshot.get is dict.get
+    assert DeviceSnapshot.__getitem__ is dict.__getitem__
+    assert DeviceSnapshot.__contains__ is dict.__contains__
+
+
+async def test_subscribers_share_one_snapshot(device_api_client, hass):
+    """Every listener sees the same objects, no per-listener copies."""
+    received = []
+    for _ in range(3):
+        device_api_client.async_subscribe_attrs(
+            ("Flow_temperature",),
+            lambda data: received.append((data, device_api_client.device_attrs)),
+        )
+    before = device_api_client.device_attrs
+
+    device_api_client._async_merge_attrs({"Flow_temperature": 45})
+    await hass.async_block_till_done()
+
+    assert len(received) == 3
+    assert all(data is received[0][0] for data, _ in received)
+    assert all(snapshot is received[0][1] for _, snapshot in received)
+    assert received[0][1] is not before
+    assert before.get("Flow_temperature") != 45
+
+
+
+def test_attribute_key_table_knows_registered_keys():
+    """Keys nobody registered are unknown."""
+    table = AttributeKeyTable()
+    table.register(("Flow_temperature", "Flow_temperature"))
+
+    assert len(table) == 1
+    assert "Flow_temperature" in table
+    assert "Vendor_specific_A" not in table